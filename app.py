@@ -14,8 +14,10 @@ This file is kept for backward compatibility with existing deployments.
 import sys
 from pathlib import Path
 
-# Add the apps directory to the path
-sys.path.append(str(Path(__file__).parent / "apps"))
+# Add the apps directory to the path (once; Streamlit re-executes this file on every rerun)
+APPS_DIR = str(Path(__file__).parent / "apps")
+if APPS_DIR not in sys.path:
+    sys.path.append(APPS_DIR)
 
 # Import and run the main application
 from streamlit_app import main
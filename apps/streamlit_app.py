@@ -6,6 +6,8 @@ using authentic Mondrian Map algorithms from the bioRxiv paper.
 """
 
 import sys
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import streamlit as st
 import pandas as pd
@@ -13,13 +15,15 @@ import numpy as np
 import pickle
 import re
 
-# Add the src directory to the path to import our modules
-sys.path.append(str(Path(__file__).parent.parent / "src"))
+# Add the src directory to the path to import our modules (once across reruns)
+SRC_DIR = str(Path(__file__).parent.parent / "src")
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
-from mondrian_map.core import Colors
+from mondrian_map.core import Colors, up_th, dn_th
 from mondrian_map.data_processing import (
-    load_pathway_info, load_dataset, load_uploaded_dataset, 
-    get_mondrian_color_description, get_colors
+    load_pathway_metadata, load_dataset, load_uploaded_dataset,
+    load_network_data, get_mondrian_color_descriptions
 )
 from mondrian_map.visualization import (
     create_authentic_mondrian_map, create_canvas_grid, create_color_legend
@@ -40,12 +44,93 @@ DATASETS = {
 # Unified Plotly configuration: interactive (hover disabled via JS) + no mode bar
 # ------------------------------------------------------------
 PLOT_CONFIG = {"displayModeBar": False}
+# Non-interactive rendering: plotly.js skips its event and drag layers entirely
+STATIC_PLOT_CONFIG = {**PLOT_CONFIG, "staticPlot": True}
 
-@st.cache_data
-def load_pathway_info_cached():
-    """Load pathway info with caching"""
-    info_path = Path("data/case_study/pathway_details/annotations_with_summary.json")
-    return load_pathway_info(info_path)
+PATHWAY_INFO_PATH = Path("data/case_study/pathway_details/annotations_with_summary.json")
+
+# The annotations are flattened once into a GS_ID-indexed frame that every dataset
+# load joins against; being read-only, one copy is shared across sessions instead
+# of unpickling a fresh copy from the data cache on every rerun
+@st.cache_resource(show_spinner=False)
+def load_pathway_metadata_cached():
+    """Load the GS_ID-indexed pathway metadata frame once per process"""
+    return load_pathway_metadata(PATHWAY_INFO_PATH)
+
+@st.cache_resource(show_spinner=False)
+def preload_builtin_datasets(_pathway_meta: pd.DataFrame) -> dict:
+    """Start loading every bundled dataset in background threads, once per process
+
+    The workers run the plain ``load_dataset`` so no Streamlit call happens
+    off the script thread. ``load_builtin_dataset`` pops each future as it
+    collects it, leaving its own cache as the only owner of the frame.
+    """
+    executor = ThreadPoolExecutor(max_workers=3)
+    futures = {name: executor.submit(load_dataset, path, _pathway_meta) for name, path in DATASETS.items()}
+    executor.shutdown(wait=False)
+    return futures
+
+@st.cache_data(show_spinner=False)
+def load_builtin_dataset(dataset_name: str, _pathway_meta: pd.DataFrame) -> pd.DataFrame:
+    """Load one of the bundled datasets with pathway metadata attached
+
+    The leading underscore keeps Streamlit from hashing the metadata frame;
+    it is fixed for the process, so the dataset name alone keys the cache.
+    """
+    future = preload_builtin_datasets(_pathway_meta).pop(dataset_name, None)
+    if future is not None:
+        if future.exception() is None:
+            return future.result()
+    # Load directly when the preload failed, so a persistent error is raised on the page
+    return load_dataset(DATASETS[dataset_name], _pathway_meta)
+
+@st.cache_data(show_spinner=False)
+def load_network_data_cached(dataset_name: str, network_dir: Path) -> pd.DataFrame:
+    """Load a dataset's pathway network CSV once per session"""
+    return load_network_data(dataset_name, network_dir)
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame, used as its cache key"""
+    digest = hashlib.md5(pd.util.hash_pandas_object(df, index=True).values)
+    digest.update(str(list(df.columns)).encode())
+    return digest.hexdigest()
+
+@st.cache_resource(show_spinner=False, hash_funcs={pd.DataFrame: hash_dataframe})
+def build_mondrian_figure(df: pd.DataFrame, dataset_name: str, maximize: bool = False,
+                          show_pathway_ids: bool = True):
+    """Build a Mondrian map figure, shared across reruns until the data changes
+
+    The returned figure is shared between sessions and must not be mutated.
+    """
+    return create_authentic_mondrian_map(df, dataset_name, maximize=maximize, show_pathway_ids=show_pathway_ids)
+
+@st.cache_resource(show_spinner=False, hash_funcs={pd.DataFrame: hash_dataframe})
+def build_canvas_figure(df_list: list, dataset_names: list, canvas_rows: int, canvas_cols: int,
+                        show_pathway_ids: bool = True):
+    """Build the canvas grid from the cached per-dataset figures, shared until any input changes
+
+    The returned figure is shared between sessions and must not be mutated.
+    """
+    canvas_maps = [build_mondrian_figure(df, name, show_pathway_ids=show_pathway_ids)
+                   for df, name in zip(df_list[:canvas_rows * canvas_cols], dataset_names)]
+    return create_canvas_grid(df_list, dataset_names, canvas_rows, canvas_cols, show_pathway_ids,
+                              maps=canvas_maps)
+
+@st.cache_resource(show_spinner=False)
+def build_color_legend():
+    """Build the fixed color legend figure once per process"""
+    return create_color_legend()
+
+@st.cache_data(show_spinner=False)
+def example_dataset_frame() -> pd.DataFrame:
+    """Example rows shown for the required CSV format"""
+    return pd.DataFrame({
+        'GS_ID': ['WAG002659', 'WAG002805'],
+        'wFC': [1.1057, 1.0888],
+        'pFDR': [3.5e-17, 5.3e-17],
+        'x': [381.9, 971.2],
+        'y': [468.9, 573.7]
+    })
 
 @st.cache_data
 def load_deg_data():
@@ -201,7 +286,7 @@ def display_dataset_crosstalks(df: pd.DataFrame, dataset_name: str, network_dir:
     
     try:
         # Load network data
-        network_df = pd.read_csv(network_path)
+        network_df = load_network_data_cached(dataset_name, network_dir)
         
         # Get pathway IDs from the current dataset
         current_pathway_ids = set(df['GS_ID'].tolist())
@@ -323,7 +408,58 @@ def display_dataset_crosstalks(df: pd.DataFrame, dataset_name: str, network_dir:
     except Exception as e:
         st.error(f"Error loading network data for {dataset_name}: {str(e)}")
 
-def create_detailed_popup(df: pd.DataFrame, dataset_name: str):
+# Columns shown in the Pathway Details tables, in display order
+DETAILS_COLUMNS = ['NAME', 'GS_ID', 'wFC', 'pFDR', 'Color', 'Description', 'Ontology', 'Disease']
+# Numbers are formatted by the browser instead of rounding the frame on every rerun
+DETAILS_COLUMN_CONFIG = {
+    'wFC': st.column_config.NumberColumn(format='%.4f'),
+    'pFDR': st.column_config.NumberColumn(format='%.2e'),
+}
+
+def pathway_details_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Project a dataset onto the details table columns, adding the color description"""
+    df_display = df[[col for col in DETAILS_COLUMNS if col != 'Color']]
+    df_display = df_display.assign(Color=get_mondrian_color_descriptions(df_display['wFC'], df_display['pFDR']))
+    return df_display[DETAILS_COLUMNS]
+
+def dataset_stats(df: pd.DataFrame, up_threshold: float = up_th,
+                  down_threshold: float = dn_th) -> dict:
+    """Regulation counts and tile color counts, all derived from one set of masks
+
+    The color counts follow ``classify_colors``: significant pathways are red
+    when up-regulated, else blue when down-regulated, else yellow.
+    """
+    wfc = df['wFC'].to_numpy()
+    up_mask = wfc >= up_threshold
+    down_mask = wfc <= down_threshold
+    sig_mask = df['pFDR'].to_numpy() < 0.05
+
+    significant = int(np.count_nonzero(sig_mask))
+    red = int(np.count_nonzero(sig_mask & up_mask))
+    blue = int(np.count_nonzero(sig_mask & down_mask & ~up_mask))
+    return {
+        'total': len(df),
+        'up': int(np.count_nonzero(up_mask)),
+        'down': int(np.count_nonzero(down_mask)),
+        'significant': significant,
+        'red': red,
+        'blue': blue,
+        'yellow': significant - red - blue,
+        'black': len(df) - significant,
+    }
+
+def top_pathways_by_abs_fc(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Select the n rows with the largest |wFC| without sorting or copying the whole frame"""
+    abs_fc = np.abs(df['wFC'].to_numpy())
+    k = min(n, len(abs_fc))
+    if k == 0:
+        return df.iloc[:0]
+    idx = np.argpartition(-abs_fc, k - 1)[:k]
+    idx = idx[np.argsort(-abs_fc[idx], kind='stable')]
+    return df.iloc[idx]
+
+def create_detailed_popup(df: pd.DataFrame, dataset_name: str, up_threshold: float = up_th,
+                          down_threshold: float = dn_th):
     """Create a detailed popup view for a specific Mondrian map"""
     st.markdown(f"## 🔍 Detailed View: {dataset_name}")
     
@@ -332,7 +468,7 @@ def create_detailed_popup(df: pd.DataFrame, dataset_name: str):
     
     with col1:
         # Show maximized Mondrian map
-        detailed_fig = create_authentic_mondrian_map(df, dataset_name, maximize=True, show_pathway_ids=True)
+        detailed_fig = build_mondrian_figure(df, dataset_name, maximize=True, show_pathway_ids=True)
         st.plotly_chart(detailed_fig, use_container_width=True, key=f"detailed_{dataset_name}", config=PLOT_CONFIG)
         
         st.info("💡 **Click pathway tiles** in the map above to see individual pathway details (hover disabled for clean view)")
@@ -341,24 +477,20 @@ def create_detailed_popup(df: pd.DataFrame, dataset_name: str):
         st.markdown("### 📊 Dataset Statistics")
         
         # Basic stats
-        total_pathways = len(df)
-        up_reg = len(df[df['wFC'] >= 1.25])
-        down_reg = len(df[df['wFC'] <= 0.75])
-        significant = len(df[df['pFDR'] < 0.05])
+        stats = dataset_stats(df, up_threshold, down_threshold)
         
-        st.metric("Total Pathways", total_pathways)
-        st.metric("Up-regulated", up_reg)
-        st.metric("Down-regulated", down_reg)
-        st.metric("Significant (p<0.05)", significant)
+        st.metric("Total Pathways", stats['total'])
+        st.metric("Up-regulated", stats['up'])
+        st.metric("Down-regulated", stats['down'])
+        st.metric("Significant (p<0.05)", stats['significant'])
         
         # Color distribution
         st.markdown("### 🎨 Color Distribution")
-        colors = get_colors(df, 1.25, 0.75)
         color_counts = {
-            "Red (Up-reg)": colors.count("red"),
-            "Blue (Down-reg)": colors.count("blue"), 
-            "Yellow (Moderate)": colors.count("yellow"),
-            "Black (Neutral)": colors.count("black")
+            "Red (Up-reg)": stats["red"],
+            "Blue (Down-reg)": stats["blue"], 
+            "Yellow (Moderate)": stats["yellow"],
+            "Black (Neutral)": stats["black"]
         }
         
         for color, count in color_counts.items():
@@ -367,10 +499,8 @@ def create_detailed_popup(df: pd.DataFrame, dataset_name: str):
         
         # Top pathways by fold change
         st.markdown("### 🔝 Top Pathways by |FC|")
-        df_with_abs_fc = df.copy()
-        df_with_abs_fc['abs_wFC'] = df_with_abs_fc['wFC'].abs()
-        top_pathways = df_with_abs_fc.nlargest(5, 'abs_wFC')[['NAME', 'wFC', 'pFDR']]
-        st.dataframe(top_pathways, use_container_width=True)
+        top_pathways = top_pathways_by_abs_fc(df[['NAME', 'wFC', 'pFDR']], 5)
+        st.dataframe(top_pathways, column_config=DETAILS_COLUMN_CONFIG, use_container_width=True)
 
 # Helper function for input validation
 
@@ -438,7 +568,9 @@ def main():
             st.sidebar.warning(f"File {file.name} has an invalid name or extension and was skipped.")
             continue
         try:
-            df = pd.read_csv(file)
+            # Only the header is needed to validate; rewind so the loader can read the file again
+            df = pd.read_csv(file, nrows=0)
+            file.seek(0)
             if not validate_csv_columns(df):
                 st.sidebar.warning(f"File {file.name} is missing required columns and was skipped.")
                 continue
@@ -448,8 +580,9 @@ def main():
     st.session_state.uploaded_files = valid_files
 
     # Load pathway info and DEG data
-    pathway_info = load_pathway_info_cached()
+    pathway_meta = load_pathway_metadata_cached()
     deg_data = load_deg_data()
+    preload_builtin_datasets(pathway_meta)
 
     # Dataset selection (multi-select)
     if not uploaded_files:
@@ -463,7 +596,7 @@ def main():
         df_list = []
         dataset_names = []
         for dataset_name in selected_datasets:
-            df = load_dataset(DATASETS[dataset_name], pathway_info)
+            df = load_builtin_dataset(dataset_name, pathway_meta)
             df_list.append(df)
             dataset_names.append(dataset_name)
     else:
@@ -471,7 +604,7 @@ def main():
         df_list = []
         dataset_names = []
         for uploaded_file in uploaded_files:
-            df = load_uploaded_dataset(uploaded_file, pathway_info)
+            df = load_uploaded_dataset(uploaded_file, pathway_meta)
             if df is not None:
                 df_list.append(df)
                 dataset_names.append(uploaded_file.name.replace('.csv', ''))
@@ -492,34 +625,50 @@ def main():
         # Display options
         show_legend = st.sidebar.checkbox("Show color legend", True)
         show_pathway_ids = st.sidebar.checkbox("Show pathway IDs", False, help="Toggle pathway ID labels on tiles")
-        show_full_size = st.sidebar.checkbox("Show full-size maps", False)
-        maximize_maps = st.sidebar.checkbox("🔍 Maximize individual maps", False, help="Show larger, detailed individual maps")
+        # One view at a time, so the overview and full-size figures are never sent together
+        view_mode = st.sidebar.radio(
+            "Map view",
+            ["Canvas overview", "Full-size maps", "🔍 Maximized maps"],
+            help="Show the canvas grid, or each map individually (maximized maps are larger and more detailed)"
+        )
+        show_full_size = view_mode != "Canvas overview"
+        maximize_maps = view_mode == "🔍 Maximized maps"
+        # Only the canvas overview has a static mode, so only offer it there
+        static_overview = not show_full_size and st.sidebar.checkbox(
+            "⚡ Static canvas overview", False,
+            help="Render the canvas grid without interactivity; faster for large grids, but tiles are not clickable")
 
     # Main content
     if len(df_list) > 0:
-        # Canvas Grid Overview
-        st.subheader("📋 Canvas Grid Overview")
-        st.markdown("*Click on individual map titles below to see detailed popup views*")
-        
-        canvas_fig = create_canvas_grid(df_list, dataset_names, canvas_rows, canvas_cols, show_pathway_ids)
-        
-        # Display the canvas with click event handling
-        canvas_container = st.container()
-        with canvas_container:
-            clicked_data = st.plotly_chart(
-                canvas_fig, 
-                use_container_width=True, 
-                key="canvas_chart", 
-                on_select="rerun",
-                config=PLOT_CONFIG
-            )
+        if not show_full_size:
+            # Canvas Grid Overview
+            st.subheader("📋 Canvas Grid Overview")
+            st.markdown("*Click on individual map titles below to see detailed popup views*")
+        
+            canvas_fig = build_canvas_figure(df_list, dataset_names, canvas_rows, canvas_cols, show_pathway_ids)
+        
+            # Display the canvas with click event handling
+            canvas_container = st.container()
+            with canvas_container:
+                if static_overview:
+                    st.plotly_chart(canvas_fig, use_container_width=True, key="canvas_chart_static",
+                                    config=STATIC_PLOT_CONFIG)
+                    clicked_data = None
+                else:
+                    clicked_data = st.plotly_chart(
+                        canvas_fig, 
+                        use_container_width=True, 
+                        key="canvas_chart", 
+                        on_select="rerun",
+                        config=PLOT_CONFIG
+                    )
             
-            # Handle pathway clicks for tooltip
-            if clicked_data and hasattr(clicked_data, 'selection') and clicked_data.selection.points:
-                if len(clicked_data.selection.points) > 0:
-                    point_data = clicked_data.selection.points[0]
-                    if 'customdata' in point_data and point_data['customdata']:
-                        st.session_state.clicked_pathway_info = point_data['customdata']
+                # Handle pathway clicks for tooltip
+                if clicked_data and hasattr(clicked_data, 'selection') and clicked_data.selection.points:
+                    if len(clicked_data.selection.points) > 0:
+                        point_data = clicked_data.selection.points[0]
+                        if 'customdata' in point_data and point_data['customdata']:
+                            st.session_state.clicked_pathway_info = point_data['customdata']
         
         # Display pathway tooltip if clicked
         if st.session_state.clicked_pathway_info:
@@ -549,7 +698,7 @@ def main():
             
             # Create columns for full-size maps
             if len(df_list) == 1:
-                full_fig = create_authentic_mondrian_map(df_list[0], dataset_names[0], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
+                full_fig = build_mondrian_figure(df_list[0], dataset_names[0], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
                 clicked_data = st.plotly_chart(
                     full_fig, 
                     use_container_width=True, 
@@ -573,7 +722,7 @@ def main():
                 for i in range(0, len(df_list), cols_per_row):
                     if cols_per_row == 1:
                         # Single column for maximized view
-                        full_fig = create_authentic_mondrian_map(df_list[i], dataset_names[i], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
+                        full_fig = build_mondrian_figure(df_list[i], dataset_names[i], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
                         clicked_data = st.plotly_chart(
                             full_fig, 
                             use_container_width=True, 
@@ -595,7 +744,7 @@ def main():
                         cols = st.columns(2)
                         
                         with cols[0]:
-                            full_fig = create_authentic_mondrian_map(df_list[i], dataset_names[i], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
+                            full_fig = build_mondrian_figure(df_list[i], dataset_names[i], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
                             clicked_data = st.plotly_chart(
                                 full_fig, 
                                 use_container_width=True, 
@@ -615,7 +764,7 @@ def main():
                         
                         if i + 1 < len(df_list):
                             with cols[1]:
-                                full_fig = create_authentic_mondrian_map(df_list[i + 1], dataset_names[i + 1], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
+                                full_fig = build_mondrian_figure(df_list[i + 1], dataset_names[i + 1], maximize=maximize_maps, show_pathway_ids=show_pathway_ids)
                                 clicked_data = st.plotly_chart(
                                     full_fig, 
                                     use_container_width=True, 
@@ -639,8 +788,8 @@ def main():
             
             with col1:
                 st.subheader("🎨 Color Legend")
-                legend_fig = create_color_legend()
-                st.plotly_chart(legend_fig, use_container_width=True, config=PLOT_CONFIG)
+                legend_fig = build_color_legend()
+                st.plotly_chart(legend_fig, use_container_width=True, config=STATIC_PLOT_CONFIG)
             
             with col2:
                 st.subheader("ℹ️ Authentic Algorithm")
@@ -670,14 +819,14 @@ def main():
         
         # Dataset Statistics
         st.subheader("📈 Dataset Statistics")
+        # Compute every dataset's counts first, then render the metrics
+        all_stats = [dataset_stats(df) for df in df_list]
         stats_cols = st.columns(len(df_list))
-        for i, (df, name) in enumerate(zip(df_list, dataset_names)):
-            with stats_cols[i]:
-                st.metric(f"{name} - Total", len(df))
-                up_reg = len(df[df['wFC'] >= 1.25])
-                down_reg = len(df[df['wFC'] <= 0.75])
-                st.metric("Up-regulated", up_reg)
-                st.metric("Down-regulated", down_reg)
+        for stats_col, name, stats in zip(stats_cols, dataset_names, all_stats):
+            with stats_col:
+                st.metric(f"{name} - Total", stats['total'])
+                st.metric("Up-regulated", stats['up'])
+                st.metric("Down-regulated", stats['down'])
         
         # Detailed pathway tables
         st.subheader("📋 Pathway Details")
@@ -688,14 +837,12 @@ def main():
             for i, (df, name) in enumerate(zip(df_list, dataset_names)):
                 with tabs[i]:
                     # Add color coding to the dataframe
-                    df_display = df.copy()
-                    df_display['Color'] = df_display.apply(
-                        lambda row: get_mondrian_color_description(row['wFC'], row['pFDR']), axis=1
-                    )
+                    df_display = pathway_details_frame(df)
                     
                     # Make pathway table clickable
                     event = st.dataframe(
-                        df_display[['NAME', 'GS_ID', 'wFC', 'pFDR', 'Color', 'Description', 'Ontology', 'Disease']].round(4),
+                        df_display,
+                        column_config=DETAILS_COLUMN_CONFIG,
                         use_container_width=True,
                         height=400,
                         on_select="rerun",
@@ -709,14 +856,12 @@ def main():
                         st.session_state.selected_pathway = selected_pathway_id
         else:
             if len(df_list) > 0:
-                df_display = df_list[0].copy()
-                df_display['Color'] = df_display.apply(
-                    lambda row: get_mondrian_color_description(row['wFC'], row['pFDR']), axis=1
-                )
+                df_display = pathway_details_frame(df_list[0])
                 
                 # Make pathway table clickable
                 event = st.dataframe(
-                    df_display[['NAME', 'GS_ID', 'wFC', 'pFDR', 'Color', 'Description', 'Ontology', 'Disease']].round(4),
+                    df_display,
+                    column_config=DETAILS_COLUMN_CONFIG,
                     use_container_width=True,
                     height=400,
                     on_select="rerun",
@@ -749,14 +894,7 @@ def main():
         
         # Show example data format
         st.subheader("📝 Required CSV Format")
-        example_df = pd.DataFrame({
-            'GS_ID': ['WAG002659', 'WAG002805'],
-            'wFC': [1.1057, 1.0888],
-            'pFDR': [3.5e-17, 5.3e-17],
-            'x': [381.9, 971.2],
-            'y': [468.9, 573.7]
-        })
-        st.dataframe(example_df)
+        st.dataframe(example_dataset_frame())
         
         st.subheader("🎯 Authentic Implementation")
         st.markdown("""
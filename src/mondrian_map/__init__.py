@@ -1,9 +1,27 @@
 # Mondrian Map Core Module
-from .core import GridSystem, Block, Line, Corner, Colors, blank_canvas
-from .data_processing import (
-    get_points, get_areas, get_colors, get_IDs, 
-    load_pathway_info, load_dataset, get_mondrian_color_description
-)
+import importlib
+
+# Re-exports are resolved on first access (PEP 562), so `import mondrian_map`
+# does not import numpy/pandas until one of them is used
+_LAZY_ATTRS = {
+    'GridSystem': 'core',
+    'Block': 'core',
+    'Line': 'core',
+    'Corner': 'core',
+    'Colors': 'core',
+    'blank_canvas': 'core',
+    'get_points': 'data_processing',
+    'get_areas': 'data_processing',
+    'get_colors': 'data_processing',
+    'get_IDs': 'data_processing',
+    'load_pathway_info': 'data_processing',
+    'load_dataset': 'data_processing',
+    'get_mondrian_color_description': 'data_processing',
+    'get_mondrian_color_descriptions': 'data_processing',
+}
+
+# Submodules resolve on attribute access too, e.g. `mondrian_map.core`
+_SUBMODULES = ('core', 'data_processing', 'visualization', 'cli')
 
 # Visualization module requires plotly - import only when needed
 # from .visualization import create_authentic_mondrian_map, create_canvas_grid, create_color_legend
@@ -12,5 +30,18 @@ __version__ = "1.0.0"
 __all__ = [
     'GridSystem', 'Block', 'Line', 'Corner', 'Colors', 'blank_canvas',
     'get_points', 'get_areas', 'get_colors', 'get_IDs',
-    'load_pathway_info', 'load_dataset', 'get_mondrian_color_description'
-] 
\ No newline at end of file
+    'load_pathway_info', 'load_dataset', 'get_mondrian_color_description',
+    'get_mondrian_color_descriptions'
+]
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_SUBMODULES))
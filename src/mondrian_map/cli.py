@@ -7,13 +7,12 @@ This module provides a simple CLI for running Mondrian Map visualizations.
 import argparse
 import sys
 from pathlib import Path
-import pandas as pd
 
-from .data_processing import load_pathway_info, load_dataset
-from .visualization import create_authentic_mondrian_map
+# pandas, numpy and plotly are imported inside main() so that --help and
+# --version return without paying for them
 
-def main():
-    """Main CLI entry point"""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser"""
     parser = argparse.ArgumentParser(
         description="Generate Mondrian Maps for pathway visualization",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -73,7 +72,11 @@ Examples:
         version="%(prog)s 1.0.0"
     )
     
-    args = parser.parse_args()
+    return parser
+
+def main():
+    """Main CLI entry point"""
+    args = _build_parser().parse_args()
     
     # Validate input file
     input_path = Path(args.input)
@@ -81,6 +84,10 @@ Examples:
         print(f"Error: Input file '{args.input}' not found", file=sys.stderr)
         sys.exit(1)
     
+    import pandas as pd
+    from .data_processing import load_pathway_info, add_pathway_metadata, DATASET_DTYPES
+    from .visualization import create_authentic_mondrian_map
+    
     # Load pathway info
     pathway_info = {}
     if args.pathway_info:
@@ -93,10 +100,11 @@ Examples:
     try:
         # Load data
         print(f"Loading data from {args.input}...")
-        df = pd.read_csv(input_path)
+        df = pd.read_csv(input_path, usecols=lambda col: col in DATASET_DTYPES,
+                         dtype=DATASET_DTYPES, engine="c")
         
         # Validate required columns
-        required_cols = ['GS_ID', 'wFC', 'pFDR', 'x', 'y']
+        required_cols = list(DATASET_DTYPES)
         missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
             print(f"Error: Missing required columns: {missing_cols}", file=sys.stderr)
@@ -104,8 +112,7 @@ Examples:
         
         # Add pathway info if available
         if pathway_info:
-            df["Description"] = df["GS_ID"].map(lambda x: pathway_info.get(x, {}).get("Description", ""))
-            df["NAME"] = df["GS_ID"].map(lambda x: pathway_info.get(x, {}).get("NAME", x))
+            df = add_pathway_metadata(df, pathway_info)
         else:
             df["Description"] = ""
             df["NAME"] = df["GS_ID"]
@@ -123,14 +130,11 @@ Examples:
         output_path = Path(args.output)
         print(f"Saving to {args.output}...")
         
+        # HTML needs no image renderer; the static formats all go through write_image
         if args.format == "html":
             fig.write_html(output_path)
-        elif args.format == "png":
-            fig.write_image(output_path, format="png")
-        elif args.format == "pdf":
-            fig.write_image(output_path, format="pdf")
-        elif args.format == "svg":
-            fig.write_image(output_path, format="svg")
+        else:
+            fig.write_image(output_path, format=args.format)
         
         print(f"✅ Mondrian Map saved successfully to {args.output}")
         
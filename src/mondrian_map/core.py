@@ -15,6 +15,7 @@ import numpy as np
 from enum import Enum
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 
 # Algorithm Constants
 LINE_WIDTH = 5
@@ -43,6 +44,16 @@ class Colors(str, Enum):
     BLUE_A = "#0300ADAA"
     YELLOW_A = "#FDDE06AA"
 
+# Tile color names used by the data pipeline, and the plain hex string of each Colors member
+_COLOR_MAP = {
+    "red": Colors.RED,
+    "blue": Colors.BLUE,
+    "yellow": Colors.YELLOW,
+    "black": Colors.BLACK,
+    "gray": Colors.GRAY
+}
+COLOR_STR = {color: color.value for color in Colors}
+
 class CornerPos(int, Enum):
     """Corner position enumeration"""
     TOP_LEFT = 0
@@ -59,6 +70,8 @@ class LineDir(str, Enum):
 
 class Point:
     """Represents a 2D point"""
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
@@ -68,8 +81,8 @@ class Point:
 
 class Line:
     """Represents a line in the Mondrian map"""
-    instances = []
-    
+    __slots__ = ('point_a', 'point_b', 'direction', 'color', 'strength', '__weakref__')
+
     def __init__(self, point_a: Point, point_b: Point, direction: LineDir, 
                  color: Colors = Colors.BLACK, strength: int = LINE_WIDTH):
         self.point_a = point_a
@@ -77,74 +90,117 @@ class Line:
         self.direction = direction
         self.color = color
         self.strength = strength
-        self.instances.append(self)
 
     def __str__(self):
         return f"({self.point_a.x}, {self.point_a.y}) to ({self.point_b.x}, {self.point_b.y})"
 
+    @classmethod
+    def from_segments(cls, segments: np.ndarray, color: Colors = Colors.BLACK,
+                      strength: int = LINE_WIDTH,
+                      directions: Optional[List[Optional[LineDir]]] = None) -> List['Line']:
+        """Build Line objects from an (N, 4) array of x1, y1, x2, y2 rows
+
+        Callers that know each segment's direction should pass ``directions``;
+        otherwise it is classified from the endpoints with ``get_line_directions``.
+        """
+        segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+        if directions is None:
+            directions = [LINE_DIRS[code] if code >= 0 else None
+                          for code in get_line_directions(segments[:, :2], segments[:, 2:]).tolist()]
+        return [cls(Point(x1, y1), Point(x2, y2), direction, color, strength)
+                for (x1, y1, x2, y2), direction in zip(segments.tolist(), directions)]
+
 class Corner:
     """Represents a corner point of a block"""
-    instances = []
+    __slots__ = ('point', 'position', 'line', '__weakref__')
 
     def __init__(self, point: Point, position: CornerPos, line: Line = None):
         self.point = point
         self.position = position
         self.line = line
-        self.instances.append(self)
 
     def __str__(self):
         return f"{self.position}: ({round(self.point.x, 2)}, {round(self.point.y, 2)})"
 
 class Block:
     """Represents a pathway block in the Mondrian map"""
-    instances = {}
-    
+    __slots__ = ('top_left_p', 'bottom_right_p', 'left', 'top', 'right', 'bottom', 'center',
+                 'area', 'color', 'id', '_top_left', '_top_right', '_bottom_left', '_bottom_right',
+                 '__weakref__')
+
     def __init__(self, top_left: Tuple[float, float], bottom_right: Tuple[float, float], 
                  area: float, color: str, id: str):
         self.top_left_p = top_left
         self.bottom_right_p = bottom_right
 
-        # Create corners with proper adjustments
-        self.top_left = Corner(Point(self.top_left_p[0] - adjust, self.top_left_p[1] - adjust), CornerPos.TOP_LEFT)
-        self.top_right = Corner(Point(self.bottom_right_p[0] + adjust, self.top_left_p[1] - adjust), CornerPos.TOP_RIGHT)
-        self.bottom_left = Corner(Point(self.top_left_p[0] - adjust, self.bottom_right_p[1] + adjust), CornerPos.BOTTOM_LEFT)
-        self.bottom_right = Corner(Point(self.bottom_right_p[0] + adjust, self.bottom_right_p[1] + adjust), CornerPos.BOTTOM_RIGHT)
+        # Outer edges, widened by half a line width on each side
+        self.left = self.top_left_p[0] - adjust
+        self.top = self.top_left_p[1] - adjust
+        self.right = self.bottom_right_p[0] + adjust
+        self.bottom = self.bottom_right_p[1] + adjust
 
-        self.center = Point((self.top_left.point.x + self.bottom_right.point.x) / 2, 
-                           (self.top_left.point.y + self.bottom_right.point.y) / 2)
+        self.center = Point((self.left + self.right) / 2, (self.top + self.bottom) / 2)
         self.area = area
-        self.color = self.get_color_map(color)
+        # Stored as the plain hex string so renderers need no per-block enum conversion
+        self.color = COLOR_STR[self.get_color_map(color)]
         self.id = id
-        self.instances[id] = self
-
-        # Create block boundary lines
-        Line(Point(self.top_left.point.x, self.top_left.point.y + adjust), 
-             Point(self.top_right.point.x, self.top_right.point.y + adjust), LineDir.RIGHT)
-        Line(Point(self.top_right.point.x - adjust, self.top_right.point.y), 
-             Point(self.bottom_right.point.x - adjust, self.bottom_right.point.y), LineDir.DOWN)
-        Line(Point(self.bottom_right.point.x, self.bottom_right.point.y - adjust), 
-             Point(self.bottom_left.point.x, self.bottom_left.point.y - adjust), LineDir.LEFT)
-        Line(Point(self.bottom_left.point.x + adjust, self.bottom_left.point.y), 
-             Point(self.top_left.point.x + adjust, self.top_left.point.y), LineDir.UP)
-
-    def get_color_map(self, color: str) -> Colors:
+
+    # Corners are only needed for blocks joined by relation lines, so build them on first use
+    def _corner(self, slot: str, x: float, y: float, position: CornerPos) -> Corner:
+        corner = getattr(self, slot, None)
+        if corner is None:
+            corner = Corner(Point(x, y), position)
+            setattr(self, slot, corner)
+        return corner
+
+    @property
+    def top_left(self) -> Corner:
+        return self._corner('_top_left', self.left, self.top, CornerPos.TOP_LEFT)
+
+    @property
+    def top_right(self) -> Corner:
+        return self._corner('_top_right', self.right, self.top, CornerPos.TOP_RIGHT)
+
+    @property
+    def bottom_left(self) -> Corner:
+        return self._corner('_bottom_left', self.left, self.bottom, CornerPos.BOTTOM_LEFT)
+
+    @property
+    def bottom_right(self) -> Corner:
+        return self._corner('_bottom_right', self.right, self.bottom, CornerPos.BOTTOM_RIGHT)
+
+    @property
+    def segments(self) -> np.ndarray:
+        """Block boundary segments (right, down, left, up) as x1, y1, x2, y2 rows"""
+        return get_boundary_segments([(self.left, self.top, self.right, self.bottom)])
+
+    @staticmethod
+    def get_color_map(color: str) -> Colors:
         """Map color string to Colors enum"""
-        color_map = {
-            "red": Colors.RED,
-            "blue": Colors.BLUE,
-            "yellow": Colors.YELLOW,
-            "black": Colors.BLACK,
-            "gray": Colors.GRAY
-        }
-        return color_map.get(color, Colors.BLACK)
+        mapped = _COLOR_MAP.get(color)
+        if mapped is None:
+            # Data-pipeline names are already lower case; only other spellings pay for casefold
+            mapped = _COLOR_MAP.get(str(color).casefold(), Colors.BLACK)
+        return mapped
 
     @property
     def height(self) -> float:
-        return self.bottom_left.point.y - self.top_left.point.y
+        return self.bottom - self.top
 
     @property
     def width(self) -> float:
-        return self.top_right.point.x - self.top_left.point.x
+        return self.right - self.left
+
+@lru_cache(maxsize=256)
+def _approximate_grid_layout(nob: int) -> Tuple[int, int]:
+    """Rows and columns for nob blocks; memoized since block counts repeat across tiles"""
+    if nob == 1:
+        return 1, 1
+    elif nob <= 4:
+        return 2, 2
+    else:
+        sqrt_nob = math.isqrt(nob)
+        return sqrt_nob, -(-nob // sqrt_nob)
 
 class GridSystem:
     """Authentic grid system for Mondrian map generation"""
@@ -155,16 +211,19 @@ class GridSystem:
         self.block_width = block_width
         self.block_height = block_height
         
-        self.grid_lines_h = {}
-        self.grid_lines_v = {}
-        
-        # Create horizontal grid lines
-        for i in range(height // block_height + 1):
-            self.grid_lines_h[f'h{i}'] = i * block_height
-        
-        # Create vertical grid lines
-        for i in range(width // block_width + 1):
-            self.grid_lines_v[f'v{i}'] = i * block_width
+        # Number of horizontal and vertical grid lines; line i sits at i * block size
+        self.nh = int(height // block_height) + 1
+        self.nv = int(width // block_width) + 1
+
+    @property
+    def grid_lines_h(self) -> np.ndarray:
+        """Horizontal grid line positions"""
+        return np.arange(self.nh) * self.block_height
+
+    @property
+    def grid_lines_v(self) -> np.ndarray:
+        """Vertical grid line positions"""
+        return np.arange(self.nv) * self.block_width
 
     def fill_blocks_around_point(self, point: Tuple[float, float], target_area: float) -> Tuple[List[Tuple[float, float]], float]:
         """
@@ -200,50 +259,119 @@ class GridSystem:
 
     def approximate_grid_layout(self, nob: int) -> Tuple[int, int]:
         """Approximate the best grid layout for a given number of blocks"""
-        if nob == 1:
-            return 1, 1
-        elif nob <= 4:
-            return 2, 2
-        else:
-            sqrt_nob = int(math.sqrt(nob))
-            return sqrt_nob, int(math.ceil(nob / sqrt_nob))
+        return _approximate_grid_layout(nob)
+
+    def fill_rectangles(self, points: np.ndarray, target_areas: np.ndarray) -> np.ndarray:
+        """Vectorized ``fill_blocks_around_point`` over all points at once
+
+        Returns an (N, 4) array of top-left x, y and bottom-right x, y.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        target_areas = np.asarray(target_areas, dtype=float)
+
+        aspect_ratio = 4 / 3
+        half_height = np.sqrt(target_areas / aspect_ratio) / 2
+        half_width = aspect_ratio * half_height
+
+        rects = np.empty((len(points), 4))
+        np.maximum(0, points[:, 0] - half_width, out=rects[:, 0])
+        np.maximum(0, points[:, 1] - half_height, out=rects[:, 1])
+        np.minimum(self.width, points[:, 0] + half_width, out=rects[:, 2])
+        np.minimum(self.height, points[:, 1] + half_height, out=rects[:, 3])
+        return rects
+
+    @staticmethod
+    def fill_area_differences(rects: np.ndarray, target_areas: np.ndarray) -> np.ndarray:
+        """Per-rectangle ``area_diff`` of ``fill_blocks_around_point`` for ``fill_rectangles`` output"""
+        rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+        actual_areas = (rects[:, 2] - rects[:, 0]) * (rects[:, 3] - rects[:, 1])
+        return np.abs(np.asarray(target_areas, dtype=float) - actual_areas)
 
     def plot_points_fill_blocks(self, points: List[Tuple[float, float]], 
                                target_areas: List[float]) -> List[List[Tuple[float, float]]]:
         """Plot points and fill blocks based on target areas"""
-        rectangles = []
-        area_diff = 0
-
-        for point, target_area in zip(points, target_areas):
-            rect, diff = self.fill_blocks_around_point(point, target_area)
-            rectangles.append(rect)
-            area_diff += diff
-
-        return rectangles
+        return [
+            [(tlx, tly), (brx, bry)]
+            for tlx, tly, brx, bry in self.fill_rectangles(points, target_areas).tolist()
+        ]
 
 def blank_canvas():
-    """Reset all instances for a fresh canvas"""
-    Corner.instances = []
-    Block.instances = {}
-    Line.instances = []
+    """No-op kept for backward compatibility
+
+    Blocks, lines and corners live only as long as the map call that creates
+    them; nothing is registered on the classes, so there is no state to reset.
+    """
+
+# Offsets that widen tile rectangles (left, top, right, bottom) to block edges
+BLOCK_EDGE_OFFSETS = np.array([-adjust, -adjust, adjust, adjust])
+
+def get_block_rects(blocks: List['Block']) -> np.ndarray:
+    """Tile rectangles (left, top, right, bottom) of blocks as an (N, 4) array"""
+    coords = [(*block.top_left_p, *block.bottom_right_p) for block in blocks]
+    return np.array(coords, dtype=float).reshape(-1, 4)
+
+def get_block_edges(rects: np.ndarray) -> np.ndarray:
+    """Block edges (left, top, right, bottom) for an (N, 4) tile rectangle array, as ``Block`` computes them"""
+    return np.asarray(rects, dtype=float).reshape(-1, 4) + BLOCK_EDGE_OFFSETS
+
+def get_boundary_segments(edges: np.ndarray) -> np.ndarray:
+    """Boundary segments (right, down, left, up) of every rectangle, inset by half a line width
+
+    ``edges`` holds left, top, right, bottom rows; the result has four
+    x1, y1, x2, y2 rows per rectangle, in rectangle order.
+    """
+    left, top, right, bottom = np.asarray(edges, dtype=float).reshape(-1, 4).T
+    return np.stack([
+        np.column_stack((left, top + adjust, right, top + adjust)),
+        np.column_stack((right - adjust, top, right - adjust, bottom)),
+        np.column_stack((right, bottom - adjust, left, bottom - adjust)),
+        np.column_stack((left + adjust, bottom, left + adjust, top)),
+    ], axis=1).reshape(-1, 4)
+
+def get_line_segments(lines: List[Line]) -> np.ndarray:
+    """Stack line endpoints into an (N, 4) array of x1, y1, x2, y2"""
+    coords = [(line.point_a.x, line.point_a.y, line.point_b.x, line.point_b.y) for line in lines]
+    return np.array(coords, dtype=float).reshape(-1, 4)
+
+def squared_distance_point(point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
+    """Squared Euclidean distance between two points, enough for comparing distances"""
+    x1, y1 = point1
+    x2, y2 = point2
+    return (x2 - x1)**2 + (y2 - y1)**2
 
 def euclidean_distance_point(point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
     """Calculate Euclidean distance between two points"""
-    x1, y1 = point1
-    x2, y2 = point2
-    return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+    return math.sqrt(squared_distance_point(point1, point2))
+
+def pairwise_distances(points_a: np.ndarray, points_b: np.ndarray, squared: bool = False) -> np.ndarray:
+    """Distances between every row of an (N, 2) and an (M, 2) point array, as an (N, M) array"""
+    diff = np.asarray(points_a, dtype=float)[:, None, :] - np.asarray(points_b, dtype=float)[None, :, :]
+    sq = np.einsum('ijk,ijk->ij', diff, diff)
+    return sq if squared else np.sqrt(sq)
+
+# Direction codes returned by get_line_direction_code(s) index into this tuple; -1 means no direction
+LINE_DIRS = (LineDir.RIGHT, LineDir.LEFT, LineDir.DOWN, LineDir.UP)
+
+def get_line_direction_code(point_a: Point, point_b: Point) -> int:
+    """Line direction between two points as a code into LINE_DIRS"""
+    dx = point_b.x - point_a.x
+    dy = point_b.y - point_a.y
+    if -adjust <= dx <= adjust:     # due to adjustment error
+        return 2 if dy > 0 else 3
+    if -adjust <= dy <= adjust:
+        return 0 if dx > 0 else 1
+    return -1
 
 def get_line_direction(point_a: Point, point_b: Point) -> Optional[LineDir]:
     """Determine line direction between two points"""
-    if abs(point_a.x - point_b.x) <= adjust:     # due to adjustment error
-        if point_a.y < point_b.y:
-            return LineDir.DOWN
-        else:
-            return LineDir.UP
-    elif abs(point_a.y - point_b.y) <= adjust:
-        if point_a.x < point_b.x:
-            return LineDir.RIGHT
-        else:
-            return LineDir.LEFT
-    else:
-        return None 
\ No newline at end of file
+    code = get_line_direction_code(point_a, point_b)
+    return LINE_DIRS[code] if code >= 0 else None
+
+def get_line_directions(points_a: np.ndarray, points_b: np.ndarray) -> np.ndarray:
+    """Vectorized get_line_direction over (N, 2) point arrays, as int8 codes into LINE_DIRS"""
+    delta = np.asarray(points_b, dtype=float).reshape(-1, 2) - np.asarray(points_a, dtype=float).reshape(-1, 2)
+    dx, dy = delta[:, 0], delta[:, 1]
+    vertical = np.abs(dx) <= adjust
+    horizontal = ~vertical & (np.abs(dy) <= adjust)
+    conditions = [vertical & (dy > 0), vertical, horizontal & (dx > 0), horizontal]
+    return np.select(conditions, [2, 3, 0, 1], default=-1).astype(np.int8)
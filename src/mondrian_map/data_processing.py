@@ -6,118 +6,215 @@ for visualization in Mondrian maps.
 """
 
 import json
+import os
+from collections import Counter
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 from .core import AREA_SCALAR, up_th, dn_th
 
+# orjson parses the annotation JSON several times faster; it is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Columns read from pathway datasets, with compact dtypes for the plotted values
+DATASET_DTYPES = {
+    "GS_ID": "category",
+    "wFC": "float32",
+    "pFDR": "float64",
+    "x": "float32",
+    "y": "float32",
+}
+
+# Annotation fields joined onto datasets, keyed by their name in the JSON
+METADATA_FIELDS = {
+    "Description": "Description",
+    "Pathway Ontology": "Ontology",
+    "Disease": "Disease",
+    "NAME": "NAME",
+}
+
 def get_points(df: pd.DataFrame, scale: float = 1) -> List[Tuple[float, float]]:
     """Extract coordinate points from dataframe"""
-    return [(round(df['x'].iloc[i] * scale, 2), round(df['y'].iloc[i] * scale, 2)) 
-            for i in range(len(df))]
+    xs = np.round(df['x'].to_numpy(dtype=np.float64) * scale, 2)
+    ys = np.round(df['y'].to_numpy(dtype=np.float64) * scale, 2)
+    return list(zip(xs.tolist(), ys.tolist()))
 
 def get_areas(df: pd.DataFrame, scale: float = AREA_SCALAR) -> List[float]:
     """Calculate areas based on fold change values"""
-    return list(abs(np.log2(df["wFC"])) * scale)
+    wfc = df["wFC"].to_numpy(dtype=np.float64)
+    return (np.abs(np.log2(wfc)) * scale).tolist()
 
 def get_colors(df: pd.DataFrame, up_threshold: float = up_th, 
                down_threshold: float = dn_th) -> List[str]:
     """Determine colors based on fold change and p-value thresholds"""
-    colors = []
-    for i, row in df.iterrows():
-        if row["pFDR"] < 0.05:
-            if row["wFC"] >= up_threshold:
-                colors.append("red")
-            elif row["wFC"] <= down_threshold:
-                colors.append("blue")
-            else:
-                colors.append("yellow")
-        else:
-            colors.append("black")
-    return colors
+    return classify_colors(df["wFC"].to_numpy(), df["pFDR"].to_numpy(),
+                           up_threshold, down_threshold).tolist()
+
+def classify_colors(wfc: np.ndarray, pfdr: np.ndarray, up_threshold: float = up_th,
+                    down_threshold: float = dn_th) -> np.ndarray:
+    """Classify fold change / p-value arrays into tile color names"""
+    significant = pfdr < 0.05
+    conditions = [
+        significant & (wfc >= up_threshold),
+        significant & (wfc <= down_threshold),
+        significant,
+    ]
+    return np.select(conditions, ["red", "blue", "yellow"], default="black")
 
 def get_IDs(df: pd.DataFrame) -> List[str]:
     """Extract pathway IDs (last 4 characters)"""
-    return [i[-4:] for i in df["GS_ID"]]
+    return df["GS_ID"].astype(str).str[-4:].tolist()
+
+def prepare_pathway_arrays(df: pd.DataFrame, scale: float = AREA_SCALAR,
+                           up_threshold: float = up_th,
+                           down_threshold: float = dn_th) -> Dict[str, np.ndarray]:
+    """Compute tile centres, areas, colors and short/full IDs as arrays in a single pass"""
+    wfc = df["wFC"].to_numpy(dtype=np.float64)
+    gs_ids = df["GS_ID"].astype(str)
+    xs = np.round(df["x"].to_numpy(dtype=np.float64), 2)
+    ys = np.round(df["y"].to_numpy(dtype=np.float64), 2)
+    return {
+        'center_points': np.column_stack((xs, ys)),
+        'areas': np.abs(np.log2(wfc)) * scale,
+        'colors': classify_colors(wfc, df["pFDR"].to_numpy(), up_threshold, down_threshold),
+        'pathway_ids': gs_ids.str[-4:].to_numpy(dtype=object),
+        'gs_ids': gs_ids.to_numpy(dtype=object),
+    }
 
 def get_relations(mem_df: Optional[pd.DataFrame], threshold: int = 2) -> List[Tuple[str, str]]:
     """Extract pathway relationships from network data"""
     if mem_df is None or len(mem_df) == 0:
         return []
     
+    gs_a_ids = mem_df["GS_A_ID"].astype(str).str[-4:].to_numpy()
+    gs_b_ids = mem_df["GS_B_ID"].astype(str).str[-4:].to_numpy()
+
     relations = []
-    rel_count = {}
-    
-    # Initialize relationship counts
-    for key in set(mem_df["GS_A_ID"]):
-        rel_count[key[-4:]] = 0
+    seen = set()
+    rel_count = Counter()
     
     # Extract relationships within threshold
-    for index, row in mem_df.iterrows():
-        gs_a_id = row["GS_A_ID"][-4:]
-        gs_b_id = row["GS_B_ID"][-4:]
-        
-        if ((gs_b_id, gs_a_id) not in relations and 
-            rel_count.get(gs_a_id, 0) < threshold and 
-            rel_count.get(gs_b_id, 0) < threshold):
+    for gs_a_id, gs_b_id in zip(gs_a_ids, gs_b_ids):
+        if ((gs_b_id, gs_a_id) not in seen and 
+            rel_count[gs_a_id] < threshold and 
+            rel_count[gs_b_id] < threshold):
             relations.append((gs_a_id, gs_b_id))
-            rel_count[gs_a_id] = rel_count.get(gs_a_id, 0) + 1
-            rel_count[gs_b_id] = rel_count.get(gs_b_id, 0) + 1
+            seen.add((gs_a_id, gs_b_id))
+            rel_count[gs_a_id] += 1
+            rel_count[gs_b_id] += 1
             
     return relations
 
-def load_pathway_info(info_path: Path) -> Dict:
-    """Load pathway annotation information"""
+@lru_cache(maxsize=8)
+def _parse_pathway_info(info_path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse an annotation file; the stat fields only key the cache"""
+    if orjson is not None:
+        return orjson.loads(Path(info_path).read_bytes())
     with open(info_path, "r") as f:
         return json.load(f)
 
-def load_dataset(path: Path, pathway_info: Dict) -> pd.DataFrame:
-    """Load and enrich dataset with pathway information"""
-    df = pd.read_csv(path)
-    
-    # Add pathway information
-    df["Description"] = df["GS_ID"].map(
-        lambda x: pathway_info.get(x, {}).get("Description", "")
-    )
-    df["Ontology"] = df["GS_ID"].map(
-        lambda x: pathway_info.get(x, {}).get("Pathway Ontology", "")
-    )
-    df["Disease"] = df["GS_ID"].map(
-        lambda x: pathway_info.get(x, {}).get("Disease", "")
-    )
-    df["NAME"] = df["GS_ID"].map(
-        lambda x: pathway_info.get(x, {}).get("NAME", x)
-    )
-    
-    return df
+def load_pathway_info(info_path: Path) -> Dict:
+    """Load pathway annotation information
+
+    Parsed files are memoized by path, modification time and size, so
+    repeated loads of an unchanged file share one dict; treat it as read-only.
+    """
+    stat = os.stat(info_path)
+    return _parse_pathway_info(str(Path(info_path).resolve()), stat.st_mtime_ns, stat.st_size)
+
+def _is_fresh(derived_path: Path, source_path: Path) -> bool:
+    """Whether a derived file exists and is no older than the file it was built from"""
+    try:
+        return derived_path.stat().st_mtime_ns >= Path(source_path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return derived_path.exists()
+
+def build_pathway_metadata(pathway_info: Dict) -> pd.DataFrame:
+    """Flatten pathway annotations into a frame indexed by GS_ID"""
+    meta_df = pd.DataFrame.from_dict(pathway_info, orient="index")
+    meta_df = meta_df.reindex(columns=list(METADATA_FIELDS))
+    return meta_df.rename(columns=METADATA_FIELDS)
+
+def convert_pathway_info_to_parquet(info_path: Path) -> Path:
+    """Write the flattened pathway metadata frame to Parquet next to the JSON"""
+    info_path = Path(info_path)
+    parquet_path = info_path.with_suffix(".parquet")
+    build_pathway_metadata(load_pathway_info(info_path)).to_parquet(parquet_path)
+    return parquet_path
+
+def load_pathway_metadata(info_path: Path) -> pd.DataFrame:
+    """Load the GS_ID-indexed metadata frame, preferring a Parquet copy at least as new as the JSON"""
+    parquet_path = Path(info_path).with_suffix(".parquet")
+    if _is_fresh(parquet_path, info_path):
+        return pd.read_parquet(parquet_path)
+    return build_pathway_metadata(load_pathway_info(info_path))
+
+def add_pathway_metadata(df: pd.DataFrame, pathway_info: Union[Dict, pd.DataFrame]) -> pd.DataFrame:
+    """Join pathway annotations onto a dataset
+
+    ``pathway_info`` may be the raw annotation dict or a frame already built
+    by ``build_pathway_metadata``; callers loading several datasets should
+    build the frame once and pass it in.
+    """
+    if isinstance(pathway_info, dict):
+        pathway_info = build_pathway_metadata(pathway_info)
+
+    # Resolve annotations once per distinct pathway, then broadcast by category code
+    ids = df["GS_ID"].astype("category")
+    meta = pathway_info.reindex(ids.cat.categories)
+    meta["NAME"] = meta["NAME"].where(meta["NAME"].notna(), meta.index.to_series())
+    text_cols = ["Description", "Ontology", "Disease"]
+    meta[text_cols] = meta[text_cols].fillna("")
+
+    # Rows without a GS_ID have code -1, which picks the blank entry appended to each column
+    missing = {"NAME": np.nan, **dict.fromkeys(text_cols, "")}
+    codes = ids.cat.codes.to_numpy()
+    return df.assign(**{col: np.append(meta[col].to_numpy(dtype=object), missing[col])[codes]
+                        for col in meta.columns})
 
-def load_uploaded_dataset(uploaded_file, pathway_info: Dict) -> Optional[pd.DataFrame]:
+def convert_dataset_to_parquet(path: Path) -> Path:
+    """Write a Parquet copy of a pathway CSV next to it with compact dtypes"""
+    path = Path(path)
+    df = pd.read_csv(path, usecols=list(DATASET_DTYPES), dtype=DATASET_DTYPES)
+    parquet_path = path.with_suffix(".parquet")
+    df.to_parquet(parquet_path, compression="zstd")
+    return parquet_path
+
+def load_dataset(path: Path, pathway_info: Union[Dict, pd.DataFrame]) -> pd.DataFrame:
+    """Load and enrich dataset with pathway information
+
+    A Parquet copy written by ``convert_dataset_to_parquet`` is preferred
+    over the CSV when it is at least as new as the CSV. Either way only the
+    columns in ``DATASET_DTYPES`` are read, with their dtypes fixed up front.
+    """
+    parquet_path = Path(path).with_suffix(".parquet")
+    if _is_fresh(parquet_path, path):
+        df = pd.read_parquet(parquet_path, columns=list(DATASET_DTYPES))
+    else:
+        df = pd.read_csv(path, usecols=list(DATASET_DTYPES), dtype=DATASET_DTYPES)
+    return add_pathway_metadata(df, pathway_info)
+
+def load_uploaded_dataset(uploaded_file, pathway_info: Union[Dict, pd.DataFrame]) -> Optional[pd.DataFrame]:
     """Load dataset from uploaded CSV file with validation"""
     try:
-        df = pd.read_csv(uploaded_file)
+        # Read only the required columns, with the same compact dtypes as the bundled
+        # datasets; the metadata join supplies the rest
+        df = pd.read_csv(uploaded_file, usecols=lambda col: col in DATASET_DTYPES,
+                         dtype=DATASET_DTYPES, engine="c")
         
         # Validate required columns
-        required_cols = ['GS_ID', 'wFC', 'pFDR', 'x', 'y']
+        required_cols = list(DATASET_DTYPES)
         missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
         
         # Add pathway information
-        df["Description"] = df["GS_ID"].map(
-            lambda x: pathway_info.get(x, {}).get("Description", "")
-        )
-        df["Ontology"] = df["GS_ID"].map(
-            lambda x: pathway_info.get(x, {}).get("Pathway Ontology", "")
-        )
-        df["Disease"] = df["GS_ID"].map(
-            lambda x: pathway_info.get(x, {}).get("Disease", "")
-        )
-        df["NAME"] = df["GS_ID"].map(
-            lambda x: pathway_info.get(x, {}).get("NAME", x)
-        )
-        
-        return df
+        return add_pathway_metadata(df, pathway_info)
         
     except Exception as e:
         print(f"Error loading dataset: {e}")
@@ -153,6 +250,15 @@ def get_mondrian_color_description(wfc: float, p_value: float) -> str:
     else:
         return 'Down-regulated'
 
+def get_mondrian_color_descriptions(wfc: np.ndarray, p_values: np.ndarray) -> np.ndarray:
+    """Vectorized ``get_mondrian_color_description`` over fold change / p-value arrays"""
+    wfc = np.asarray(wfc)
+    p_values = np.asarray(p_values)
+    abs_wfc = np.abs(wfc)
+    conditions = [p_values > 0.05, abs_wfc < 0.5, abs_wfc < 1.0, wfc > 0]
+    choices = ['Non-significant', 'Neutral', 'Moderate change', 'Up-regulated']
+    return np.select(conditions, choices, default='Down-regulated')
+
 def prepare_pathway_data(df: pd.DataFrame, dataset_name: str, 
                         network_dir: Optional[Path] = None) -> Dict:
     """Prepare all data needed for Mondrian map creation"""
@@ -170,17 +276,7 @@ def prepare_pathway_data(df: pd.DataFrame, dataset_name: str,
             ].reset_index(drop=True)
     
     # Prepare all required data
-    center_points = get_points(df, 1)
-    areas = get_areas(df, AREA_SCALAR)
-    colors = get_colors(df, up_th, dn_th)
-    pathway_ids = get_IDs(df)
-    relations = get_relations(mem_df) if mem_df is not None else []
-    
-    return {
-        'center_points': center_points,
-        'areas': areas,
-        'colors': colors,
-        'pathway_ids': pathway_ids,
-        'relations': relations,
-        'network_data': mem_df
-    } 
\ No newline at end of file
+    data = prepare_pathway_arrays(df, AREA_SCALAR, up_th, dn_th)
+    data['relations'] = get_relations(mem_df) if mem_df is not None else []
+    data['network_data'] = mem_df
+    return data 
\ No newline at end of file
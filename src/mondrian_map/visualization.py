@@ -5,8 +5,9 @@ This module contains the visualization functions including the complex
 line generation algorithms and Plotly figure creation.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
@@ -14,33 +15,75 @@ from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 from .core import (
-    GridSystem, Block, Line, Corner, Point, Colors, CornerPos, LineDir,
-    blank_canvas, get_line_direction, euclidean_distance_point,
+    GridSystem, Block, Line, Corner, Point, Colors, COLOR_STR, CornerPos, LineDir,
+    LINE_DIRS, get_line_direction, get_line_direction_code, get_line_segments, get_block_rects, get_block_edges,
     LINE_WIDTH, THIN_LINE_WIDTH, adjust, adjust_e, adjust_d
 )
 from .data_processing import prepare_pathway_data, get_mondrian_color_description
 
 def get_closest_corner(block_a: Block, block_b: Block) -> Corner:
-    """Find the closest corner of block_a to block_b's center"""
-    min_distance = float('inf')
-    closest_corner = None
-
-    for corner in [block_a.top_left, block_a.top_right, block_a.bottom_right, block_a.bottom_left]:
-        distance = abs(corner.point.x - block_b.center.x) + abs(corner.point.y - block_b.center.y)
-        if distance < min_distance:
-            min_distance = distance
-            closest_corner = corner
-
-    return closest_corner
+    """Find the closest (Manhattan) corner of block_a to block_b's center"""
+    return get_connecting_corners([block_a, block_b], np.array([0]), np.array([1]))[0][0]
+
+# Corner attribute order of the corner arrays; ties go to the earlier corner
+CORNER_ORDER = ('top_left', 'top_right', 'bottom_right', 'bottom_left')
+
+def get_connecting_corners(blocks: List[Block], source_idx: np.ndarray, target_idx: np.ndarray,
+                           edges: Optional[np.ndarray] = None) -> List[Tuple[Corner, Corner, bool]]:
+    """Pick the corners joining each source/target block pair in one pass
+
+    The source corner is the one closest (Manhattan) to the target centre. The
+    target corner is the one nearest the source centre that lies outside the
+    source block on both axes, falling back to the target corner closest to
+    the source centre; the flag records whether such an outside corner exists.
+    ``edges`` may pass the blocks' (left, top, right, bottom) array when the
+    caller already has it.
+    """
+    if edges is None:
+        edges = np.array([(block.left, block.top, block.right, block.bottom) for block in blocks],
+                         dtype=float).reshape(-1, 4)
+    left, top, right, bottom = edges.T
+    corners = np.stack((
+        np.column_stack((left, top)),
+        np.column_stack((right, top)),
+        np.column_stack((right, bottom)),
+        np.column_stack((left, bottom)),
+    ), axis=1)
+    centers = np.column_stack(((left + right) / 2, (top + bottom) / 2))
+
+    src_corners, tgt_corners = corners[source_idx], corners[target_idx]
+    src_centers, tgt_centers = centers[source_idx], centers[target_idx]
+
+    cp1_pos = np.abs(src_corners - tgt_centers[:, None, :]).sum(axis=2).argmin(axis=1)
+
+    # Candidate target corners are scanned top-left, top-right, bottom-left, bottom-right
+    cand = tgt_corners[:, [0, 1, 3, 2]]
+    cand_x, cand_y = cand[..., 0], cand[..., 1]
+    src_left, src_top = src_corners[:, 0, 0, None], src_corners[:, 0, 1, None]
+    src_right, src_bottom = src_corners[:, 1, 0, None], src_corners[:, 3, 1, None]
+    outside = ((src_left > cand_x) | (src_right < cand_x)) & ((src_top > cand_y) | (src_bottom < cand_y))
+    # Only the nearest candidate matters, so compare squared distances
+    dist = (cand_x - src_centers[:, None, 0]) ** 2 + (cand_y - src_centers[:, None, 1]) ** 2
+    cp2_outside = outside.any(axis=1)
+    cp2_cand_pos = np.where(outside, dist, np.inf).argmin(axis=1)
+    cp2_fallback_pos = np.abs(tgt_corners - src_centers[:, None, :]).sum(axis=2).argmin(axis=1)
+    cp2_pos = np.where(cp2_outside, np.array([0, 1, 3, 2])[cp2_cand_pos], cp2_fallback_pos)
+
+    return [
+        (getattr(blocks[s], CORNER_ORDER[p1]), getattr(blocks[t], CORNER_ORDER[p2]), bool(found))
+        for s, t, p1, p2, found in zip(source_idx.tolist(), target_idx.tolist(),
+                                       cp1_pos.tolist(), cp2_pos.tolist(), cp2_outside.tolist())
+    ]
 
 def get_furthest_connector(cp1: Corner, cp2: Corner, center: Point) -> Point:
     """Get the furthest connector point between two corners"""
-    p = Point(cp1.point.x, cp2.point.y)
-    q = Point(cp2.point.x, cp1.point.y)
-    if euclidean_distance_point((p.x, p.y), (center.x, center.y)) > euclidean_distance_point((q.x, q.y), (center.x, center.y)):
-        return p
+    # Candidates are (cp1.x, cp2.y) and (cp2.x, cp1.y); squared distances are enough to compare
+    x1, y1 = cp1.point.x - center.x, cp1.point.y - center.y
+    x2, y2 = cp2.point.x - center.x, cp2.point.y - center.y
+    if x1 * x1 + y2 * y2 > x2 * x2 + y1 * y1:
+        return Point(cp1.point.x, cp2.point.y)
     else:
-        return q
+        return Point(cp2.point.x, cp1.point.y)
 
 def get_manhattan_line_color(block_a: Block, block_b: Block) -> Colors:
     """Determine the color of Manhattan lines between blocks"""
@@ -51,314 +94,254 @@ def get_manhattan_line_color(block_a: Block, block_b: Block) -> Colors:
     else:
         return Colors.YELLOW
 
+# End-point offsets (dx_start, dy_start, dx_end, dy_end) that seat Manhattan lines on block
+# edges, keyed by corner position (and line direction for the two-segment case)
+STRAIGHT_V_OFFSETS = {
+    CornerPos.TOP_LEFT: (adjust, 0, adjust, 0),
+    CornerPos.BOTTOM_LEFT: (adjust, 0, adjust, 0),
+    CornerPos.TOP_RIGHT: (-adjust, 0, -adjust, 0),
+    CornerPos.BOTTOM_RIGHT: (-adjust, 0, -adjust, 0),
+}
+
+STRAIGHT_H_OFFSETS = {
+    CornerPos.TOP_LEFT: (-adjust_d, adjust, 0, adjust),
+    CornerPos.TOP_RIGHT: (adjust_d, adjust, 0, adjust),
+    CornerPos.BOTTOM_LEFT: (-adjust_d, -adjust, 0, -adjust),
+    CornerPos.BOTTOM_RIGHT: (adjust_d, -adjust, 0, -adjust),
+}
+
+# Line A runs from corner A to the connector
+LINE_A_OFFSETS = {
+    (CornerPos.TOP_LEFT, LineDir.RIGHT): (0, adjust, 0, adjust),
+    (CornerPos.TOP_LEFT, LineDir.LEFT): (-adjust_d, adjust, 0, adjust),
+    (CornerPos.TOP_RIGHT, LineDir.RIGHT): (adjust_d, adjust, 0, adjust),
+    (CornerPos.TOP_RIGHT, LineDir.LEFT): (0, adjust, 0, adjust),
+    (CornerPos.BOTTOM_LEFT, LineDir.RIGHT): (0, -adjust, 0, -adjust),
+    (CornerPos.BOTTOM_LEFT, LineDir.LEFT): (-adjust_d, -adjust, 0, -adjust),
+    (CornerPos.BOTTOM_RIGHT, LineDir.RIGHT): (adjust_d, -adjust, 0, -adjust),
+    (CornerPos.BOTTOM_RIGHT, LineDir.LEFT): (0, -adjust, 0, -adjust),
+    (CornerPos.TOP_LEFT, LineDir.UP): (adjust, -adjust_d, adjust, 0),
+    (CornerPos.TOP_LEFT, LineDir.DOWN): (adjust, 0, adjust, 0),
+    (CornerPos.BOTTOM_LEFT, LineDir.UP): (adjust, 0, adjust, 0),
+    (CornerPos.BOTTOM_LEFT, LineDir.DOWN): (adjust, adjust_d, adjust, 0),
+    (CornerPos.TOP_RIGHT, LineDir.UP): (-adjust, -adjust_d, -adjust, 0),
+    (CornerPos.TOP_RIGHT, LineDir.DOWN): (-adjust, 0, -adjust, 0),
+    (CornerPos.BOTTOM_RIGHT, LineDir.UP): (-adjust, 0, -adjust, 0),
+    (CornerPos.BOTTOM_RIGHT, LineDir.DOWN): (-adjust, adjust_d, -adjust, 0),
+}
+
+# Line B runs from the connector to corner B
+LINE_B_OFFSETS = {
+    (CornerPos.TOP_LEFT, LineDir.RIGHT): (-adjust * 2, adjust, -adjust_d, adjust),
+    (CornerPos.TOP_LEFT, LineDir.LEFT): (0, adjust, 0, adjust),
+    (CornerPos.TOP_RIGHT, LineDir.RIGHT): (0, adjust, 0, adjust),
+    (CornerPos.TOP_RIGHT, LineDir.LEFT): (adjust * 2, adjust, adjust_d, adjust),
+    (CornerPos.BOTTOM_LEFT, LineDir.RIGHT): (-adjust * 2, -adjust, -adjust_d, -adjust),
+    (CornerPos.BOTTOM_LEFT, LineDir.LEFT): (0, -adjust, 0, -adjust),
+    (CornerPos.BOTTOM_RIGHT, LineDir.RIGHT): (0, -adjust, 0, -adjust),
+    (CornerPos.BOTTOM_RIGHT, LineDir.LEFT): (adjust * 2, -adjust, adjust_d, -adjust),
+    (CornerPos.TOP_LEFT, LineDir.DOWN): (adjust, -adjust * 2, adjust, -adjust_d),
+    (CornerPos.TOP_LEFT, LineDir.UP): (adjust, 0, adjust, 0),
+    (CornerPos.BOTTOM_LEFT, LineDir.DOWN): (adjust, 0, adjust, 0),
+    (CornerPos.BOTTOM_LEFT, LineDir.UP): (adjust, adjust * 2, adjust, adjust_d),
+    (CornerPos.TOP_RIGHT, LineDir.DOWN): (-adjust, -adjust * 2, -adjust, -adjust_d),
+    (CornerPos.TOP_RIGHT, LineDir.UP): (-adjust, 0, -adjust, 0),
+    (CornerPos.BOTTOM_RIGHT, LineDir.DOWN): (-adjust, 0, -adjust, 0),
+    (CornerPos.BOTTOM_RIGHT, LineDir.UP): (-adjust, adjust * 2, -adjust, adjust_d),
+}
+
+def get_offset_table(offsets: Dict) -> Tuple:
+    """Nest a (CornerPos, LineDir) offset dict as table[position][direction code]
+
+    A trailing None column makes the "no direction" code -1 map to no offset.
+    """
+    return tuple(tuple(offsets.get((pos, line_dir)) for line_dir in LINE_DIRS) + (None,)
+                 for pos in CornerPos)
+
+LINE_A_OFFSET_TABLE = get_offset_table(LINE_A_OFFSETS)
+LINE_B_OFFSET_TABLE = get_offset_table(LINE_B_OFFSETS)
+
+def get_offset_line(start: Point, end: Point, offsets: Optional[Tuple[float, float, float, float]],
+                    direction: Optional[LineDir], color: Colors) -> Line:
+    """Create a line between two points shifted by (dx_start, dy_start, dx_end, dy_end)"""
+    if offsets is None:
+        return Line(start, end, direction, color=color)
+    dx0, dy0, dx1, dy1 = offsets
+    return Line(Point(start.x + dx0, start.y + dy0), Point(end.x + dx1, end.y + dy1), direction, color=color)
+
 def get_manhattan_lines_2(corner_a: Corner, corner_b: Corner, connector: Point, color: Colors) -> List[Line]:
     """Generate Manhattan-style connection lines between corners"""
     if corner_a.point.x == corner_b.point.x and corner_a.point.y != corner_b.point.y:
-        if corner_a.position in [CornerPos.TOP_LEFT, CornerPos.BOTTOM_LEFT]:
-            line_v = Line(Point(corner_a.point.x + adjust, corner_a.point.y), Point(corner_b.point.x + adjust, corner_b.point.y), get_line_direction(corner_a.point, corner_b.point), color=color)
-        if corner_a.position in [CornerPos.TOP_RIGHT, CornerPos.BOTTOM_RIGHT]:
-            line_v = Line(Point(corner_a.point.x - adjust, corner_a.point.y), Point(corner_b.point.x - adjust, corner_b.point.y), get_line_direction(corner_a.point, corner_b.point), color=color)
+        line_v = get_offset_line(corner_a.point, corner_b.point, STRAIGHT_V_OFFSETS[corner_a.position],
+                                 get_line_direction(corner_a.point, corner_b.point), color)
         corner_a.line = line_v
         corner_b.line = line_v
         return [line_v]
 
     elif (corner_a.point.x != corner_b.point.x and corner_a.point.y == corner_b.point.y):
-        if corner_a.position == CornerPos.TOP_LEFT:
-            line_h = Line(Point(corner_a.point.x - adjust_d, corner_a.point.y + adjust), Point(corner_b.point.x, corner_b.point.y + adjust), get_line_direction(corner_a.point, corner_b.point), color=color)
-        elif corner_a.position == CornerPos.TOP_RIGHT:
-            line_h = Line(Point(corner_a.point.x + adjust_d, corner_a.point.y + adjust), Point(corner_b.point.x, corner_b.point.y + adjust), get_line_direction(corner_a.point, corner_b.point), color=color)
-        elif corner_a.position == CornerPos.BOTTOM_LEFT:
-            line_h = Line(Point(corner_a.point.x - adjust_d, corner_a.point.y - adjust), Point(corner_b.point.x, corner_b.point.y - adjust), get_line_direction(corner_a.point, corner_b.point), color=color)
-        elif corner_a.position == CornerPos.BOTTOM_RIGHT:
-            line_h = Line(Point(corner_a.point.x + adjust_d, corner_a.point.y - adjust), Point(corner_b.point.x, corner_b.point.y - adjust), get_line_direction(corner_a.point, corner_b.point), color=color)
+        line_h = get_offset_line(corner_a.point, corner_b.point, STRAIGHT_H_OFFSETS[corner_a.position],
+                                 get_line_direction(corner_a.point, corner_b.point), color)
         corner_a.line = line_h
         corner_b.line = line_h
         return [line_h]
 
     # Complex case with connector point
-    line_a_dir = get_line_direction(corner_a.point, connector)
-    line_b_dir = get_line_direction(connector, corner_b.point)
-    
-    # Create line A
-    if corner_a.position in [CornerPos.TOP_LEFT, CornerPos.TOP_RIGHT] and line_a_dir in [LineDir.LEFT, LineDir.RIGHT]:
-        if corner_a.position == CornerPos.TOP_RIGHT and line_a_dir == LineDir.RIGHT:
-            line_a = Line(Point(corner_a.point.x + adjust_d, corner_a.point.y + adjust), Point(connector.x, connector.y + adjust), line_a_dir, color=color)
-        elif corner_a.position == CornerPos.TOP_LEFT and line_a_dir == LineDir.LEFT:
-            line_a = Line(Point(corner_a.point.x - adjust_d, corner_a.point.y + adjust), Point(connector.x, connector.y + adjust), line_a_dir, color=color)
-        else:
-            line_a = Line(Point(corner_a.point.x, corner_a.point.y + adjust), Point(connector.x, connector.y + adjust), line_a_dir, color=color)
-    elif corner_a.position in [CornerPos.BOTTOM_LEFT, CornerPos.BOTTOM_RIGHT] and line_a_dir in [LineDir.LEFT, LineDir.RIGHT]:
-        if corner_a.position == CornerPos.BOTTOM_RIGHT and line_a_dir == LineDir.RIGHT:
-            line_a = Line(Point(corner_a.point.x + adjust_d, corner_a.point.y - adjust), Point(connector.x, connector.y - adjust), line_a_dir, color=color)
-        elif corner_a.position == CornerPos.BOTTOM_LEFT and line_a_dir == LineDir.LEFT:
-            line_a = Line(Point(corner_a.point.x - adjust_d, corner_a.point.y - adjust), Point(connector.x, connector.y - adjust), line_a_dir, color=color)
-        else:
-            line_a = Line(Point(corner_a.point.x, corner_a.point.y - adjust), Point(connector.x, connector.y - adjust), line_a_dir, color=color)
-    elif corner_a.position in [CornerPos.TOP_LEFT, CornerPos.BOTTOM_LEFT] and line_a_dir in [LineDir.UP, LineDir.DOWN]:
-        if corner_a.position == CornerPos.TOP_LEFT and line_a_dir == LineDir.UP:
-            line_a = Line(Point(corner_a.point.x + adjust, corner_a.point.y - adjust_d), Point(connector.x + adjust, connector.y), line_a_dir, color=color)
-        elif corner_a.position == CornerPos.BOTTOM_LEFT and line_a_dir == LineDir.DOWN:
-            line_a = Line(Point(corner_a.point.x + adjust, corner_a.point.y + adjust_d), Point(connector.x + adjust, connector.y), line_a_dir, color=color)
-        else:
-            line_a = Line(Point(corner_a.point.x + adjust, corner_a.point.y), Point(connector.x + adjust, connector.y), line_a_dir, color=color)
-    elif corner_a.position in [CornerPos.TOP_RIGHT, CornerPos.BOTTOM_RIGHT] and line_a_dir in [LineDir.UP, LineDir.DOWN]:
-        if corner_a.position == CornerPos.TOP_RIGHT and line_a_dir == LineDir.UP:
-            line_a = Line(Point(corner_a.point.x - adjust, corner_a.point.y - adjust_d), Point(connector.x - adjust, connector.y), line_a_dir, color=color)
-        elif corner_a.position == CornerPos.BOTTOM_RIGHT and line_a_dir == LineDir.DOWN:
-            line_a = Line(Point(corner_a.point.x - adjust, corner_a.point.y + adjust_d), Point(connector.x - adjust, connector.y), line_a_dir, color=color)
-        else:
-            line_a = Line(Point(corner_a.point.x - adjust, corner_a.point.y), Point(connector.x - adjust, connector.y), line_a_dir, color=color)
-    else:
-        line_a = Line(corner_a.point, connector, line_a_dir, color=color)
-
-    # Create line B
-    if corner_b.position in [CornerPos.TOP_LEFT, CornerPos.TOP_RIGHT] and line_b_dir in [LineDir.LEFT, LineDir.RIGHT]:
-        if corner_b.position == CornerPos.TOP_LEFT and line_b_dir == LineDir.RIGHT:
-            line_b = Line(Point(connector.x - adjust*2, connector.y + adjust), Point(corner_b.point.x - adjust_d, corner_b.point.y + adjust), line_b_dir, color=color)
-        elif corner_b.position == CornerPos.TOP_RIGHT and line_b_dir == LineDir.LEFT:
-            line_b = Line(Point(connector.x + adjust*2, connector.y + adjust), Point(corner_b.point.x + adjust_d, corner_b.point.y + adjust), line_b_dir, color=color)
-        else:
-            line_b = Line(Point(connector.x, connector.y + adjust), Point(corner_b.point.x, corner_b.point.y + adjust), line_b_dir, color=color)
-    elif corner_b.position in [CornerPos.BOTTOM_LEFT, CornerPos.BOTTOM_RIGHT] and line_b_dir in [LineDir.LEFT, LineDir.RIGHT]:
-        if corner_b.position == CornerPos.BOTTOM_LEFT and line_b_dir == LineDir.RIGHT:
-            line_b = Line(Point(connector.x - adjust*2, connector.y - adjust), Point(corner_b.point.x - adjust_d, corner_b.point.y - adjust), line_b_dir, color=color)
-        elif corner_b.position == CornerPos.BOTTOM_RIGHT and line_b_dir == LineDir.LEFT:
-            line_b = Line(Point(connector.x + adjust*2, connector.y - adjust), Point(corner_b.point.x + adjust_d, corner_b.point.y - adjust), line_b_dir, color=color)
-        else:
-            line_b = Line(Point(connector.x, connector.y - adjust), Point(corner_b.point.x, corner_b.point.y - adjust), line_b_dir, color=color)
-    elif corner_b.position in [CornerPos.TOP_LEFT, CornerPos.BOTTOM_LEFT] and line_b_dir in [LineDir.UP, LineDir.DOWN]:
-        if corner_b.position == CornerPos.TOP_LEFT and line_b_dir == LineDir.DOWN:
-            line_b = Line(Point(connector.x + adjust, connector.y - adjust*2), Point(corner_b.point.x + adjust, corner_b.point.y - adjust_d), line_b_dir, color=color)
-        elif corner_b.position == CornerPos.BOTTOM_LEFT and line_b_dir == LineDir.UP:
-            line_b = Line(Point(connector.x + adjust, connector.y + adjust*2), Point(corner_b.point.x + adjust, corner_b.point.y + adjust_d), line_b_dir, color=color)
-        else:
-            line_b = Line(Point(connector.x + adjust, connector.y), Point(corner_b.point.x + adjust, corner_b.point.y), line_b_dir, color=color)
-    elif corner_b.position in [CornerPos.TOP_RIGHT, CornerPos.BOTTOM_RIGHT] and line_b_dir in [LineDir.UP, LineDir.DOWN]:
-        if corner_b.position == CornerPos.TOP_RIGHT and line_b_dir == LineDir.DOWN:
-            line_b = Line(Point(connector.x - adjust, connector.y - adjust*2), Point(corner_b.point.x - adjust, corner_b.point.y - adjust_d), line_b_dir, color=color)
-        elif corner_b.position == CornerPos.BOTTOM_RIGHT and line_b_dir == LineDir.UP:
-            line_b = Line(Point(connector.x - adjust, connector.y + adjust*2), Point(corner_b.point.x - adjust, corner_b.point.y + adjust_d), line_b_dir, color=color)
-        else:
-            line_b = Line(Point(connector.x - adjust, connector.y), Point(corner_b.point.x - adjust, corner_b.point.y), line_b_dir, color=color)
-    else:
-        line_b = Line(connector, corner_b.point, line_b_dir, color=color)
+    code_a = get_line_direction_code(corner_a.point, connector)
+    code_b = get_line_direction_code(connector, corner_b.point)
+
+    line_a = get_offset_line(corner_a.point, connector, LINE_A_OFFSET_TABLE[corner_a.position][code_a],
+                             LINE_DIRS[code_a] if code_a >= 0 else None, color)
+    line_b = get_offset_line(connector, corner_b.point, LINE_B_OFFSET_TABLE[corner_b.position][code_b],
+                             LINE_DIRS[code_b] if code_b >= 0 else None, color)
 
     corner_a.line = line_a
     corner_b.line = line_b
     return [line_a, line_b]
 
-def create_smart_grid_lines(grid_system: GridSystem, blocks: List[Block]) -> List[Line]:
+def get_free_grid_intervals(positions: np.ndarray, span_lo: np.ndarray, span_hi: np.ndarray,
+                            seg_lo: np.ndarray, seg_hi: np.ndarray, min_gap: float = 10,
+                            canvas_size: float = 1000) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the stretches of each grid line that run between tiles
+
+    A grid line at ``positions[i]`` crosses every tile whose span
+    ``[span_lo, span_hi]`` contains it; those tiles occupy ``[seg_lo, seg_hi]``
+    along the line. Returns (line index, start, end) arrays for the stretch
+    before the first tile, gaps wider than ``min_gap`` between consecutive
+    tiles, and the stretch after the last tile. Lines that cross no tile
+    span the whole canvas.
     """
-    Two-step grid line algorithm:
-    1. Create full Manhattan grid
-    2. Remove lines that go canvas edge to edge without hitting tile corners
-    3. Trim line segments that cross tile middles, stopping at tile corners
+    # Visit tiles along each line in (start, end) order
+    order = np.lexsort((seg_hi, seg_lo))
+    span_lo, span_hi, seg_lo, seg_hi = span_lo[order], span_hi[order], seg_lo[order], seg_hi[order]
+
+    hits = (span_lo <= positions[:, None]) & (positions[:, None] <= span_hi)
+    rows, cols = np.nonzero(hits)
+    same_line = rows[1:] == rows[:-1]
+    first = np.concatenate(([True], ~same_line)) if len(rows) else np.zeros(0, dtype=bool)
+    last = np.concatenate((~same_line, [True])) if len(rows) else np.zeros(0, dtype=bool)
+    step = np.arange(len(rows))
+
+    head_end = seg_lo[cols[first]]
+    gap_start, gap_end = seg_hi[cols[:-1][same_line]], seg_lo[cols[1:][same_line]]
+    tail_start = seg_hi[cols[last]]
+    empty = np.setdiff1d(np.arange(len(positions)), rows)
+
+    keep_head, keep_gap, keep_tail = head_end > 0, gap_end - gap_start > min_gap, tail_start < canvas_size
+    line_idx = np.concatenate((rows[first][keep_head], rows[:-1][same_line][keep_gap],
+                               rows[last][keep_tail], empty))
+    starts = np.concatenate((np.zeros(keep_head.sum()), gap_start[keep_gap], tail_start[keep_tail],
+                             np.zeros(len(empty))))
+    ends = np.concatenate((head_end[keep_head], gap_end[keep_gap], np.full(keep_tail.sum(), canvas_size),
+                           np.full(len(empty), canvas_size)))
+    # Keep each line's stretches in drawing order: head, gaps, tail
+    sub_order = np.concatenate((np.full(keep_head.sum(), -1), step[:-1][same_line][keep_gap],
+                                np.full(keep_tail.sum(), len(rows)), np.full(len(empty), -1)))
+    order = np.lexsort((sub_order, line_idx))
+    return line_idx[order], starts[order], ends[order]
+
+def create_smart_grid_segments(blocks: List[Block]) -> np.ndarray:
     """
-    smart_lines = []
-    
-    # Get all tile corner positions
-    tile_corners = set()
-    for block in blocks:
-        tile_corners.add((block.top_left_p[0], block.top_left_p[1]))      # top-left
-        tile_corners.add((block.bottom_right_p[0], block.top_left_p[1]))  # top-right
-        tile_corners.add((block.top_left_p[0], block.bottom_right_p[1]))  # bottom-left
-        tile_corners.add((block.bottom_right_p[0], block.bottom_right_p[1])) # bottom-right
-    
-    # Get all unique x and y positions from corners
-    x_positions = set(corner[0] for corner in tile_corners)
-    y_positions = set(corner[1] for corner in tile_corners)
-    
-    # STEP 1: Create full Manhattan grid lines
-    full_grid_lines = []
-    
-    # Create full vertical lines
-    for x_pos in x_positions:
-        if 0 < x_pos < 1000:  # Skip canvas boundaries
-            full_grid_lines.append({
-                'type': 'vertical',
-                'position': x_pos,
-                'start': 0,
-                'end': 1000
-            })
-    
-    # Create full horizontal lines  
-    for y_pos in y_positions:
-        if 0 < y_pos < 1000:  # Skip canvas boundaries
-            full_grid_lines.append({
-                'type': 'horizontal', 
-                'position': y_pos,
-                'start': 0,
-                'end': 1000
-            })
-    
-    # STEP 2: Remove lines that go canvas edge to edge without hitting tile corners
-    valid_lines = []
-    for line in full_grid_lines:
-        hits_corner = False
-        
-        if line['type'] == 'vertical':
-            x_pos = line['position']
-            # Check if this vertical line hits any tile corner
-            for corner_x, corner_y in tile_corners:
-                if corner_x == x_pos:
-                    hits_corner = True
-                    break
-        else:  # horizontal
-            y_pos = line['position']
-            # Check if this horizontal line hits any tile corner
-            for corner_x, corner_y in tile_corners:
-                if corner_y == y_pos:
-                    hits_corner = True
-                    break
-        
-        if hits_corner:
-            valid_lines.append(line)
-    
-    # STEP 3: Create line segments from canvas edge to tile borders (stop at first tile encounter)
-    for line in valid_lines:
-        if line['type'] == 'vertical':
-            x_pos = line['position']
-            
-            # Find all tile boundaries that this vertical line would encounter
-            tile_boundaries = []
-            for block in blocks:
-                if block.top_left_p[0] <= x_pos <= block.bottom_right_p[0]:
-                    tile_boundaries.append((block.top_left_p[1], block.bottom_right_p[1], 'tile'))
-            
-            # Sort boundaries by y position
-            tile_boundaries.sort()
-            
-            # Create line from top canvas edge to first tile boundary
-            if tile_boundaries:
-                first_tile_top = tile_boundaries[0][0]
-                if first_tile_top > 0:
-                    smart_lines.append(Line(
-                        Point(x_pos, 0), 
-                        Point(x_pos, first_tile_top), 
-                        LineDir.DOWN, 
-                        Colors.LIGHT_GRAY, 
-                        1
-                    ))
-                
-                # Create lines between tiles (in gaps)
-                for i in range(len(tile_boundaries) - 1):
-                    gap_start = tile_boundaries[i][1]  # End of current tile
-                    gap_end = tile_boundaries[i + 1][0]  # Start of next tile
-                    
-                    if gap_end - gap_start > 10:  # Minimum gap size
-                        smart_lines.append(Line(
-                            Point(x_pos, gap_start), 
-                            Point(x_pos, gap_end), 
-                            LineDir.DOWN, 
-                            Colors.LIGHT_GRAY, 
-                            1
-                        ))
-                
-                # Create line from last tile boundary to bottom canvas edge
-                last_tile_bottom = tile_boundaries[-1][1]
-                if last_tile_bottom < 1000:
-                    smart_lines.append(Line(
-                        Point(x_pos, last_tile_bottom), 
-                        Point(x_pos, 1000), 
-                        LineDir.DOWN, 
-                        Colors.LIGHT_GRAY, 
-                        1
-                    ))
-            else:
-                # No tiles intersect this line, draw full line
-                smart_lines.append(Line(
-                    Point(x_pos, 0), 
-                    Point(x_pos, 1000), 
-                    LineDir.DOWN, 
-                    Colors.LIGHT_GRAY, 
-                    1
-                ))
-        
-        else:  # horizontal line
-            y_pos = line['position']
-            
-            # Find all tile boundaries that this horizontal line would encounter
-            tile_boundaries = []
-            for block in blocks:
-                if block.top_left_p[1] <= y_pos <= block.bottom_right_p[1]:
-                    tile_boundaries.append((block.top_left_p[0], block.bottom_right_p[0], 'tile'))
-            
-            # Sort boundaries by x position
-            tile_boundaries.sort()
-            
-            # Create line from left canvas edge to first tile boundary
-            if tile_boundaries:
-                first_tile_left = tile_boundaries[0][0]
-                if first_tile_left > 0:
-                    smart_lines.append(Line(
-                        Point(0, y_pos), 
-                        Point(first_tile_left, y_pos), 
-                        LineDir.RIGHT, 
-                        Colors.LIGHT_GRAY, 
-                        1
-                    ))
-                
-                # Create lines between tiles (in gaps)
-                for i in range(len(tile_boundaries) - 1):
-                    gap_start = tile_boundaries[i][1]  # End of current tile
-                    gap_end = tile_boundaries[i + 1][0]  # Start of next tile
-                    
-                    if gap_end - gap_start > 10:  # Minimum gap size
-                        smart_lines.append(Line(
-                            Point(gap_start, y_pos), 
-                            Point(gap_end, y_pos), 
-                            LineDir.RIGHT, 
-                            Colors.LIGHT_GRAY, 
-                            1
-                        ))
-                
-                # Create line from last tile boundary to right canvas edge
-                last_tile_right = tile_boundaries[-1][1]
-                if last_tile_right < 1000:
-                    smart_lines.append(Line(
-                        Point(last_tile_right, y_pos), 
-                        Point(1000, y_pos), 
-                        LineDir.RIGHT, 
-                        Colors.LIGHT_GRAY, 
-                        1
-                    ))
-            else:
-                # No tiles intersect this line, draw full line
-                smart_lines.append(Line(
-                    Point(0, y_pos), 
-                    Point(1000, y_pos), 
-                    LineDir.RIGHT, 
-                    Colors.LIGHT_GRAY, 
-                    1
-                ))
-    
-    return smart_lines
+    Two-step grid line algorithm, emitted as an (N, 4) x1, y1, x2, y2 segment array:
+    1. Create full Manhattan grid through every tile corner
+    2. Trim line segments that cross tile middles, stopping at tile corners
+    """
+    if not blocks:
+        return np.zeros((0, 4))
+
+    # Tile corner coordinates: left, top, right, bottom
+    tiles = get_block_rects(blocks)
+    left, top, right, bottom = tiles.T
+
+    # Grid lines through every interior tile corner position
+    xs = np.unique(np.concatenate((left, right)))
+    xs = xs[(xs > 0) & (xs < 1000)]
+    ys = np.unique(np.concatenate((top, bottom)))
+    ys = ys[(ys > 0) & (ys < 1000)]
+
+    v_idx, v_start, v_end = get_free_grid_intervals(xs, left, right, top, bottom)
+    h_idx, h_start, h_end = get_free_grid_intervals(ys, top, bottom, left, right)
+
+    vertical = np.column_stack((xs[v_idx], v_start, xs[v_idx], v_end))
+    horizontal = np.column_stack((h_start, ys[h_idx], h_end, ys[h_idx]))
+    return np.concatenate((vertical, horizontal))
+
+def create_smart_grid_lines(grid_system: GridSystem, blocks: List[Block]) -> List[Line]:
+    """Grid lines from ``create_smart_grid_segments`` as Line objects"""
+    segments = create_smart_grid_segments(blocks)
+    # Grid segments are built vertical (top to bottom) or horizontal (left to right)
+    directions = [LineDir.DOWN if x1 == x2 else LineDir.RIGHT for x1, x2 in segments[:, [0, 2]].tolist()]
+    return Line.from_segments(segments, Colors.LIGHT_GRAY, 1, directions)
 
 def get_meaningful_tile_edges(blocks: List[Block]) -> Dict:
-    """Get tile edges that are structurally important"""
+    """Get tile edges that are structurally important
+
+    Besides the edge sets and per-id ``tile_bounds``, the result carries the
+    (N, 4) ``bounds`` array (also presorted per axis as ``bounds_by_top`` and
+    ``bounds_by_left``) and the ``edges_at_x``/``edges_at_y`` buckets used by
+    the segment finders, all derived from one pass over the blocks.
+    """
+    rects = get_block_rects(blocks)
+    left, top, right, bottom = rects.T
     edges = {
-        'vertical': set(),
-        'horizontal': set(),
-        'tile_bounds': {}
-    }
-    
-    for block in blocks:
-        # Store tile boundaries for intersection checking
-        edges['tile_bounds'][block.id] = {
-            'left': block.top_left_p[0],
-            'right': block.bottom_right_p[0], 
-            'top': block.top_left_p[1],
-            'bottom': block.bottom_right_p[1]
-        }
-        
         # Add significant edges (not all edges, only structurally important ones)
-        edges['vertical'].add(block.top_left_p[0])   # left edge
-        edges['vertical'].add(block.bottom_right_p[0])  # right edge
-        edges['horizontal'].add(block.top_left_p[1])  # top edge
-        edges['horizontal'].add(block.bottom_right_p[1])  # bottom edge
-    
+        'vertical': set(np.concatenate((left, right)).tolist()),
+        'horizontal': set(np.concatenate((top, bottom)).tolist()),
+        # Store tile boundaries for intersection checking
+        'tile_bounds': {
+            block.id: {'left': l, 'right': r, 'top': t, 'bottom': b}
+            for block, (l, t, r, b) in zip(blocks, rects.tolist())
+        },
+        'bounds': get_tile_bounds(blocks, rects),
+    }
+    # Sorted once per axis so each segment query can skip sorting its spans
+    edges['bounds_by_top'] = sort_tile_bounds(edges['bounds'], 0)
+    edges['bounds_by_left'] = sort_tile_bounds(edges['bounds'], 1)
+    edges['edges_at_x'], edges['edges_at_y'] = get_edge_buckets(blocks, rects)
     return edges
 
+def get_edge_buckets(blocks: List[Block], rects: Optional[np.ndarray] = None) -> Tuple[Dict, Dict]:
+    """Map each vertical edge x to its (top, bottom) spans and each horizontal edge y to its (left, right) spans"""
+    if rects is None:
+        rects = get_block_rects(blocks)
+    edges_at_x, edges_at_y = {}, {}
+    for left, top, right, bottom in rects.tolist():
+        for x in (left, right):
+            edges_at_x.setdefault(x, []).append((top, bottom))
+        for y in (top, bottom):
+            edges_at_y.setdefault(y, []).append((left, right))
+    return edges_at_x, edges_at_y
+
+def get_tile_bounds(blocks: List[Block], rects: Optional[np.ndarray] = None) -> np.ndarray:
+    """Tile boundaries as an (N, 4) array of left, right, top, bottom"""
+    if rects is None:
+        rects = get_block_rects(blocks)
+    return rects[:, [0, 2, 1, 3]]
+
+def sort_tile_bounds(bounds: np.ndarray, axis: int) -> np.ndarray:
+    """Order tile bounds by the spans ``get_occupied_ranges`` returns for ``axis``"""
+    spans = bounds[:, 2 - 2 * axis:4 - 2 * axis]
+    return bounds[np.lexsort((spans[:, 1], spans[:, 0]))]
+
+def get_occupied_ranges(bounds: np.ndarray, pos: float, axis: int) -> np.ndarray:
+    """Sorted (M, 2) spans of the tiles a line at ``pos`` crosses or touches
+
+    ``axis`` 0 is a vertical line (``pos`` is x, spans are top/bottom) and 1 a
+    horizontal one (``pos`` is y, spans are left/right). ``bounds`` must come
+    from ``sort_tile_bounds`` for the same axis; the mask keeps that order.
+    """
+    low, high = bounds[:, 2 * axis], bounds[:, 2 * axis + 1]
+    return bounds[(low <= pos) & (pos <= high)][:, 2 - 2 * axis:4 - 2 * axis]
+
+def merge_ranges(spans: np.ndarray) -> List[Tuple[float, float]]:
+    """Merge sorted (M, 2) spans, joining any that overlap or touch"""
+    if len(spans) == 0:
+        return []
+    starts, ends = spans[:, 0], np.maximum.accumulate(spans[:, 1])
+    # A span opens a new run when it starts past everything merged so far
+    opens = np.flatnonzero(np.r_[True, starts[1:] > ends[:-1]])
+    closes = np.r_[opens[1:] - 1, len(spans) - 1]
+    return list(zip(starts[opens].tolist(), ends[closes].tolist()))
+
 def create_meaningful_vertical_lines(grid_system: GridSystem, blocks: List[Block], tile_edges: Dict) -> List[Line]:
     """Create vertical lines that serve structural purpose"""
     lines = []
@@ -407,142 +390,123 @@ def create_meaningful_horizontal_lines(grid_system: GridSystem, blocks: List[Blo
 
 def find_structural_vertical_segments(x_pos: float, blocks: List[Block], tile_edges: Dict) -> List[Tuple[float, float]]:
     """Find vertical line segments that serve structural purpose"""
-    segments = []
+    bounds = tile_edges.get('bounds_by_top')
+    if bounds is None:
+        bounds = sort_tile_bounds(get_tile_bounds(blocks), 0)
     
-    # Find tiles that this vertical line would intersect or touch
-    intersecting_tiles = []
-    touching_tiles = []
-    
-    for block in blocks:
-        bounds = tile_edges['tile_bounds'][block.id]
-        
-        # Check if line intersects tile interior
-        if bounds['left'] < x_pos < bounds['right']:
-            intersecting_tiles.append((bounds['top'], bounds['bottom']))
-        # Check if line touches tile edge
-        elif bounds['left'] == x_pos or bounds['right'] == x_pos:
-            touching_tiles.append((bounds['top'], bounds['bottom']))
+    # Merged ranges of the tiles this line would intersect or touch
+    merged = merge_ranges(get_occupied_ranges(bounds, x_pos, 0))
     
     # Only create segments where line serves structural purpose
-    if not touching_tiles and not intersecting_tiles:
-        return []  # No structural purpose
-    
-    # Sort all occupied ranges
-    all_occupied = sorted(intersecting_tiles + touching_tiles)
-    
-    # Merge overlapping ranges
-    merged = []
-    for start, end in all_occupied:
-        if merged and start <= merged[-1][1]:
-            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-        else:
-            merged.append((start, end))
-    
-    # Create segments only in meaningful gaps
     if not merged:
-        return []
+        return []  # No structural purpose
     
+    segments = []
     # Only create segments that connect to tile edges or canvas
     current_y = 0
     for start, end in merged:
         # Segment before tile (only if it connects to something meaningful)
-        if current_y < start and (current_y == 0 or has_structural_purpose_vertical(x_pos, current_y, start, blocks)):
+        if current_y < start and (current_y == 0 or has_structural_purpose_vertical(x_pos, current_y, start, blocks, tile_edges.get('edges_at_y'))):
             segments.append((current_y, start))
         current_y = max(current_y, end)
     
     # Final segment to canvas edge (only if meaningful)
-    if current_y < 1000 and has_structural_purpose_vertical(x_pos, current_y, 1000, blocks):
+    if current_y < 1000 and has_structural_purpose_vertical(x_pos, current_y, 1000, blocks, tile_edges.get('edges_at_y')):
         segments.append((current_y, 1000))
     
     return segments
 
 def find_structural_horizontal_segments(y_pos: float, blocks: List[Block], tile_edges: Dict) -> List[Tuple[float, float]]:
     """Find horizontal line segments that serve structural purpose"""
-    segments = []
+    bounds = tile_edges.get('bounds_by_left')
+    if bounds is None:
+        bounds = sort_tile_bounds(get_tile_bounds(blocks), 1)
     
-    # Find tiles that this horizontal line would intersect or touch
-    intersecting_tiles = []
-    touching_tiles = []
-    
-    for block in blocks:
-        bounds = tile_edges['tile_bounds'][block.id]
-        
-        # Check if line intersects tile interior
-        if bounds['top'] < y_pos < bounds['bottom']:
-            intersecting_tiles.append((bounds['left'], bounds['right']))
-        # Check if line touches tile edge
-        elif bounds['top'] == y_pos or bounds['bottom'] == y_pos:
-            touching_tiles.append((bounds['left'], bounds['right']))
+    # Merged ranges of the tiles this line would intersect or touch
+    merged = merge_ranges(get_occupied_ranges(bounds, y_pos, 1))
     
     # Only create segments where line serves structural purpose
-    if not touching_tiles and not intersecting_tiles:
-        return []  # No structural purpose
-    
-    # Sort all occupied ranges
-    all_occupied = sorted(intersecting_tiles + touching_tiles)
-    
-    # Merge overlapping ranges
-    merged = []
-    for start, end in all_occupied:
-        if merged and start <= merged[-1][1]:
-            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-        else:
-            merged.append((start, end))
-    
-    # Create segments only in meaningful gaps
     if not merged:
-        return []
+        return []  # No structural purpose
     
+    segments = []
     # Only create segments that connect to tile edges or canvas
     current_x = 0
     for start, end in merged:
         # Segment before tile (only if it connects to something meaningful)
-        if current_x < start and (current_x == 0 or has_structural_purpose_horizontal(y_pos, current_x, start, blocks)):
+        if current_x < start and (current_x == 0 or has_structural_purpose_horizontal(y_pos, current_x, start, blocks, tile_edges.get('edges_at_x'))):
             segments.append((current_x, start))
         current_x = max(current_x, end)
     
     # Final segment to canvas edge (only if meaningful)
-    if current_x < 1000 and has_structural_purpose_horizontal(y_pos, current_x, 1000, blocks):
+    if current_x < 1000 and has_structural_purpose_horizontal(y_pos, current_x, 1000, blocks, tile_edges.get('edges_at_x')):
         segments.append((current_x, 1000))
     
     return segments
 
-def has_structural_purpose_vertical(x_pos: float, start_y: float, end_y: float, blocks: List[Block]) -> bool:
-    """Check if a vertical line segment serves structural purpose"""
+def has_structural_purpose_vertical(x_pos: float, start_y: float, end_y: float, blocks: List[Block],
+                                    edges_at_y: Optional[Dict] = None) -> bool:
+    """Check if a vertical line segment serves structural purpose
+
+    ``edges_at_y`` is the bucket map from ``get_edge_buckets``; it is built
+    from ``blocks`` when not given.
+    """
+    if edges_at_y is None:
+        edges_at_y = get_edge_buckets(blocks)[1]
     # Check if segment endpoints align with tile edges
-    start_touches_tile = any(
-        (block.top_left_p[1] == start_y or block.bottom_right_p[1] == start_y) and
-        (block.top_left_p[0] <= x_pos <= block.bottom_right_p[0])
-        for block in blocks
-    )
-    
-    end_touches_tile = any(
-        (block.top_left_p[1] == end_y or block.bottom_right_p[1] == end_y) and
-        (block.top_left_p[0] <= x_pos <= block.bottom_right_p[0])
-        for block in blocks
-    )
+    start_touches_tile = any(left <= x_pos <= right for left, right in edges_at_y.get(start_y, ()))
+    end_touches_tile = any(left <= x_pos <= right for left, right in edges_at_y.get(end_y, ()))
     
     # Has purpose if it connects tile edges or extends from tile to canvas
     return start_touches_tile or end_touches_tile or start_y == 0 or end_y == 1000
 
-def has_structural_purpose_horizontal(y_pos: float, start_x: float, end_x: float, blocks: List[Block]) -> bool:
-    """Check if a horizontal line segment serves structural purpose"""
+def has_structural_purpose_horizontal(y_pos: float, start_x: float, end_x: float, blocks: List[Block],
+                                      edges_at_x: Optional[Dict] = None) -> bool:
+    """Check if a horizontal line segment serves structural purpose
+
+    ``edges_at_x`` is the bucket map from ``get_edge_buckets``; it is built
+    from ``blocks`` when not given.
+    """
+    if edges_at_x is None:
+        edges_at_x = get_edge_buckets(blocks)[0]
     # Check if segment endpoints align with tile edges
-    start_touches_tile = any(
-        (block.top_left_p[0] == start_x or block.bottom_right_p[0] == start_x) and
-        (block.top_left_p[1] <= y_pos <= block.bottom_right_p[1])
-        for block in blocks
-    )
-    
-    end_touches_tile = any(
-        (block.top_left_p[0] == end_x or block.bottom_right_p[0] == end_x) and
-        (block.top_left_p[1] <= y_pos <= block.bottom_right_p[1])
-        for block in blocks
-    )
+    start_touches_tile = any(top <= y_pos <= bottom for top, bottom in edges_at_x.get(start_x, ()))
+    end_touches_tile = any(top <= y_pos <= bottom for top, bottom in edges_at_x.get(end_x, ()))
     
     # Has purpose if it connects tile edges or extends from tile to canvas
     return start_touches_tile or end_touches_tile or start_x == 0 or end_x == 1000
 
+# Canvas outline (right, down, left, up) as x1, y1, x2, y2 rows
+CANVAS_BORDER_SEGMENTS = np.array([
+    (0, 0, 1000, 0),
+    (1000, 0, 1000, 1000),
+    (1000, 1000, 0, 1000),
+    (0, 1000, 0, 0),
+], dtype=float)
+
+def get_line_path_shape(segments: np.ndarray, color: str, width: float) -> Dict:
+    """Draw an (N, 4) array of x1, y1, x2, y2 segments as a single SVG path shape"""
+    path = "".join(f"M{x0:.6f},{y0:.6f}L{x1:.6f},{y1:.6f}" for x0, y0, x1, y1 in segments.tolist())
+    return dict(type="path", path=path, line=dict(color=color, width=width), layer="above")
+
+def get_block_fill_trace(rects: np.ndarray, fill_color: str, meta: Optional[Dict] = None) -> go.Scatter:
+    """Draw an (N, 4) array of x0, y0, x1, y1 rectangles as one filled trace with NaN gaps"""
+    x0, y0, x1, y1 = rects.T
+    gap = np.full(len(rects), np.nan)
+    return go.Scatter(
+        x=np.column_stack((x0, x1, x1, x0, x0, gap)).ravel(),
+        y=np.column_stack((y0, y0, y1, y1, y0, gap)).ravel(),
+        fill="toself",
+        fillcolor=fill_color,
+        line=dict(width=0),
+        mode="lines",
+        hoverinfo='none',
+        name="",
+        showlegend=False,
+        customdata=None,
+        meta=meta
+    )
+
 def create_authentic_mondrian_map(df: pd.DataFrame, dataset_name: str, 
                                  mem_df: Optional[pd.DataFrame] = None, 
                                  maximize: bool = False, 
@@ -562,60 +526,58 @@ def create_authentic_mondrian_map(df: pd.DataFrame, dataset_name: str,
     colors = data['colors']
     pathway_ids = data['pathway_ids']
     relations = data['relations']
+    gs_ids = data['gs_ids']
 
     # Initialize canvas
-    blank_canvas()
     grid_system = GridSystem(1001, 1001, 20, 20)
     
-    # Sort data by area (largest first)
-    sorted_data = sorted(zip(areas, center_points, colors, pathway_ids), reverse=True)
-    areas_sorted, center_points_sorted, colors_sorted, pathway_ids_sorted = zip(*sorted_data)
+    # Sort data by area (largest first); ties fall back to centre, colour and IDs, all descending
+    order = np.lexsort((
+        -np.unique(gs_ids, return_inverse=True)[1],
+        -np.unique(pathway_ids, return_inverse=True)[1],
+        -np.unique(colors, return_inverse=True)[1],
+        -center_points[:, 1],
+        -center_points[:, 0],
+        -areas,
+    ))
+    areas_sorted = areas[order]
+    center_points_sorted = center_points[order]
+    colors_sorted = colors[order]
+    pathway_ids_sorted = pathway_ids[order]
+    gs_ids_sorted = gs_ids[order]
 
     # Get rectangles from grid system
-    rectangles = grid_system.plot_points_fill_blocks(center_points_sorted, areas_sorted)
-
-    # Create border lines
-    Line(Point(0, 0), Point(1000, 0), LineDir.RIGHT, Colors.GRAY, THIN_LINE_WIDTH)
-    Line(Point(1000, 0), Point(1000, 1000), LineDir.DOWN, Colors.GRAY, THIN_LINE_WIDTH)
-    Line(Point(1000, 1000), Point(0, 1000), LineDir.LEFT, Colors.GRAY, THIN_LINE_WIDTH)
-    Line(Point(0, 1000), Point(0, 0), LineDir.UP, Colors.GRAY, THIN_LINE_WIDTH)
+    block_rects = grid_system.fill_rectangles(center_points_sorted, areas_sorted)
 
     # STAGE 1: Create blocks
     all_blocks = []
-    for idx, rect in enumerate(rectangles):
-        b = Block(rect[0], rect[1], areas_sorted[idx], colors_sorted[idx], pathway_ids_sorted[idx])
+    for (tlx, tly, brx, bry), area, color, pathway_id in zip(block_rects.tolist(), areas_sorted.tolist(),
+                                                             colors_sorted.tolist(), pathway_ids_sorted.tolist()):
+        b = Block((tlx, tly), (brx, bry), area, color, pathway_id)
         all_blocks.append(b)
     
-    # Create smart grid lines that avoid intersecting tiles (after blocks are created)
-    smart_grid_lines = create_smart_grid_lines(grid_system, all_blocks)
+    # Create smart grid segments that avoid intersecting tiles (after blocks are created)
+    grid_segments = create_smart_grid_segments(all_blocks)
 
     # STAGE 2: Create relationship lines (Manhattan lines for PAG-to-PAG crosstalk)
     all_manhattan_lines = []
     lines_to_extend = []
-    for rel in relations:
-        if rel[0] in Block.instances.keys() and rel[1] in Block.instances.keys():
-            s = Block.instances[rel[0]]
-            b = Block.instances[rel[1]]
-        else:
-            continue
+    block_index = {block.id: idx for idx, block in enumerate(all_blocks)}
+    rel_pairs = np.array([(block_index[a], block_index[b]) for a, b in relations
+                          if a in block_index and b in block_index], dtype=np.intp).reshape(-1, 2)
+    connecting_corners = get_connecting_corners(all_blocks, rel_pairs[:, 0], rel_pairs[:, 1],
+                                                get_block_edges(block_rects))
+
+    for (s_idx, b_idx), (cp1, cp2, cp2_outside) in zip(rel_pairs, connecting_corners):
+        s = all_blocks[s_idx]
+        b = all_blocks[b_idx]
         
         manhattan_line_color = get_manhattan_line_color(s, b)
 
-        cp1 = get_closest_corner(s, b)
-        cp2 = None
-        dist = float('inf')
-
-        for corner in [b.top_left, b.top_right, b.bottom_left, b.bottom_right]:
-            if (s.top_left.point.x > corner.point.x or s.top_right.point.x < corner.point.x) and (s.top_left.point.y > corner.point.y or s.bottom_left.point.y < corner.point.y):
-                d = euclidean_distance_point((s.center.x, s.center.y), (corner.point.x, corner.point.y))
-                if d < dist:
-                    cp2 = corner
-                    dist = d
-        if cp2 == None:
-            cp2 = get_closest_corner(b, s)
-            con = get_furthest_connector(cp1, cp2, s.center)
-        else:
+        if cp2_outside:
             con = get_furthest_connector(cp1, cp2, b.center)
+        else:
+            con = get_furthest_connector(cp1, cp2, s.center)
 
         lines = get_manhattan_lines_2(cp1, cp2, con, manhattan_line_color)
 
@@ -626,74 +588,40 @@ def create_authentic_mondrian_map(df: pd.DataFrame, dataset_name: str,
             all_manhattan_lines.extend(lines)
             lines_to_extend.extend(lines)
     
-    # Convert to Plotly traces
+    # Convert tiles to Plotly traces, one per fill colour
     traces = []
     
-    # Add blocks as filled rectangles
-    for block in all_blocks:
-        # Rectangle coordinates
-        x_coords = [block.top_left_p[0], block.bottom_right_p[0], block.bottom_right_p[0], block.top_left_p[0], block.top_left_p[0]]
-        y_coords = [block.top_left_p[1], block.top_left_p[1], block.bottom_right_p[1], block.bottom_right_p[1], block.top_left_p[1]]
-        
-        # Get pathway info for hover
-        pathway_idx = pathway_ids_sorted.index(block.id)
-        pathway_row = df[df["GS_ID"].str.endswith(block.id)].iloc[0]
-        
-        # Convert Colors enum to string for Plotly
-        fill_color = str(block.color.value) if hasattr(block.color, 'value') else str(block.color)
-        
-        traces.append(go.Scatter(
-            x=x_coords,
-            y=y_coords,
-            fill="toself",
-            fillcolor=fill_color,
-            line=dict(width=0),
-            mode="lines",
-            hoverinfo='none',
-            name="",
-            showlegend=False,
-            customdata=None,
-            meta={'dataset': dataset_name, 'pathway_id': pathway_row['GS_ID']}
+    # Add blocks as filled rectangles, grouped by colour
+    block_colors = np.array([block.color for block in all_blocks])
+
+    for fill_color in dict.fromkeys(block_colors.tolist()):
+        mask = block_colors == fill_color
+        traces.append(get_block_fill_trace(
+            block_rects[mask],
+            fill_color,
+            meta={'dataset': dataset_name, 'pathway_ids': gs_ids_sorted[mask].tolist()}
         ))
 
+    # Lines go in the shapes layer: one path per style, drawn above the tiles
+    shapes = []
+
     # Add smart grid lines (lightest gray, thin lines)
-    for line in smart_grid_lines:
-        traces.append(go.Scatter(
-            x=[line.point_a.x, line.point_b.x],
-            y=[line.point_a.y, line.point_b.y],
-            mode="lines",
-            line=dict(color="#F5F5F5", width=1),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    if len(grid_segments):
+        shapes.append(get_line_path_shape(grid_segments, "#F5F5F5", 1))
 
-    # Add canvas border lines
-    border_lines = [line for line in Line.instances if line.strength == THIN_LINE_WIDTH]
-    
-    for line in border_lines:
-        traces.append(go.Scatter(
-            x=[line.point_a.x, line.point_b.x],
-            y=[line.point_a.y, line.point_b.y],
-            mode="lines",
-            line=dict(color="#808080", width=2),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    # Add canvas border lines (the thin grid lines are redrawn in the border style on top)
+    border_segments = np.concatenate((CANVAS_BORDER_SEGMENTS, grid_segments))
+    shapes.append(get_line_path_shape(border_segments, "#808080", 2))
 
-    # Add Manhattan relationship lines (PAG-to-PAG crosstalk)
-    for line in all_manhattan_lines:
-        line_color = str(line.color.value) if hasattr(line.color, 'value') else str(line.color)
-        traces.append(go.Scatter(
-            x=[line.point_a.x, line.point_b.x],
-            y=[line.point_a.y, line.point_b.y],
-            mode="lines",
-            line=dict(color=line_color, width=2),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    # Add Manhattan relationship lines (PAG-to-PAG crosstalk), grouped by colour
+    manhattan_segments = get_line_segments(all_manhattan_lines)
+    manhattan_colors = np.array([COLOR_STR[line.color] for line in all_manhattan_lines])
+
+    for line_color in dict.fromkeys(manhattan_colors.tolist()):
+        shapes.append(get_line_path_shape(manhattan_segments[manhattan_colors == line_color], line_color, 2))
 
     # Create figure
-    fig = go.Figure(data=traces)
+    fig = go.Figure(data=traces, layout=dict(shapes=shapes))
     
     # Set figure size based on maximize option
     if maximize:
@@ -725,8 +653,13 @@ def create_authentic_mondrian_map(df: pd.DataFrame, dataset_name: str,
 
 def create_canvas_grid(df_list: List[pd.DataFrame], dataset_names: List[str], 
                       canvas_rows: int, canvas_cols: int, 
-                      show_pathway_ids: bool = True) -> go.Figure:
-    """Create the canvas grid that holds multiple Mondrian maps"""
+                      show_pathway_ids: bool = True,
+                      maps: Optional[List[go.Figure]] = None) -> go.Figure:
+    """Create the canvas grid that holds multiple Mondrian maps
+
+    Prebuilt per-dataset figures may be passed as ``maps`` (e.g. from a cache)
+    to avoid rebuilding each map.
+    """
     fig = make_subplots(
         rows=canvas_rows, 
         cols=canvas_cols,
@@ -736,17 +669,30 @@ def create_canvas_grid(df_list: List[pd.DataFrame], dataset_names: List[str],
         vertical_spacing=0.1
     )
     
+    cells = list(zip(df_list[:canvas_rows*canvas_cols], dataset_names[:canvas_rows*canvas_cols]))
+
+    # Create individual Mondrian maps; each is independent, so build them in parallel.
+    # A frame shown twice under the same name is built once (cells keeps it alive, so its id is stable)
+    if maps is None:
+        unique_cells = {(id(df), name): (df, name) for df, name in cells}
+        with ThreadPoolExecutor(max_workers=min(len(unique_cells), os.cpu_count() or 1) or 1) as executor:
+            built = dict(zip(unique_cells, executor.map(
+                lambda cell: create_authentic_mondrian_map(cell[0], cell[1], mem_df=None, maximize=False,
+                                                           show_pathway_ids=show_pathway_ids),
+                unique_cells.values()
+            )))
+        maps = [built[id(df), name] for df, name in cells]
+
     # Add each Mondrian map to its canvas cell
-    for idx, (df, name) in enumerate(zip(df_list[:canvas_rows*canvas_cols], dataset_names[:canvas_rows*canvas_cols])):
+    for idx, mondrian_fig in enumerate(maps[:len(cells)]):
         row = idx // canvas_cols + 1
         col = idx % canvas_cols + 1
         
-        # Create individual Mondrian map for this dataset
-        mondrian_fig = create_authentic_mondrian_map(df, name, mem_df=None, maximize=False, show_pathway_ids=show_pathway_ids)
-        
-        # Add traces to subplot
+        # Add traces and line shapes to subplot
         for trace in mondrian_fig.data:
             fig.add_trace(trace, row=row, col=col)
+        for shape in mondrian_fig.layout.shapes:
+            fig.add_shape(shape, row=row, col=col)
         
         # Configure subplot axes
         fig.update_xaxes(
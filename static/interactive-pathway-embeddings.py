@@ -1,7 +1,30 @@
+import numpy as np
 import plotly.express as px
 import matplotlib.colors as mcolors
 
-plot_df = pd.DataFrame(normalized_embedding, columns=['x', 'y'])
+# Above these sizes, thin the scatter to one marker per grid cell, or bin it into an image
+LOD_THRESHOLD = 20_000
+RASTER_THRESHOLD = 100_000
+
+def decimate_points(plot_df, cells=128):
+    """Keep one representative point per occupied cell of a cells x cells grid"""
+    x = plot_df['x'].to_numpy()
+    y = plot_df['y'].to_numpy()
+    cell_x = np.floor((x - x.min()) / (np.ptp(x) or 1) * (cells - 1)).astype(np.int32)
+    cell_y = np.floor((y - y.min()) / (np.ptp(y) or 1) * (cells - 1)).astype(np.int32)
+    return plot_df.groupby(cell_y * cells + cell_x, sort=False).head(1)
+
+def rasterize_points(plot_df, bins=800):
+    """Aggregate points into a fixed-resolution density image (Datashader-style)"""
+    counts, x_edges, y_edges = np.histogram2d(plot_df['x'], plot_df['y'], bins=bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    fig = px.imshow(np.log1p(counts.T), x=x_centers, y=y_centers, origin='lower',
+                    color_continuous_scale='Blues', width=800, height=800)
+    fig.update_coloraxes(showscale=False)
+    return fig
+
+plot_df = pd.DataFrame(normalized_embedding, columns=['x', 'y']).astype('float32')
 plot_df["GS_ID"] = list(prompts.keys())
 # plot_df["NAME"] = [f'({key}) {pathway_info[key]["NAME"]}<br>{" ".join([p.split("), ")[-1] for p in prompts[key][1].split(" (")][:-1])}' for key in pathway_info.keys()]
 plot_df["NAME"] = [f'({key}) {pathway_info[key]["NAME"]}' for key in pathway_info.keys()]
@@ -11,7 +34,12 @@ color_map = {label: color for label, color in zip(unique_labels, px.colors.quali
 plot_df["Color"] = plot_df["Color"].map(color_map)
 
 
-fig = px.scatter(plot_df, x='x', y='y', hover_name='NAME', width=800, height=800, opacity=0.7)   # color='Color'
+if len(plot_df) > RASTER_THRESHOLD:
+    fig = rasterize_points(plot_df)
+else:
+    scatter_df = decimate_points(plot_df) if len(plot_df) > LOD_THRESHOLD else plot_df
+    fig = px.scatter(scatter_df, x='x', y='y', hover_name='NAME', width=800, height=800, opacity=0.7, render_mode='webgl')   # color='Color'
+    fig.update_traces(hovertemplate='%{hovertext}<extra></extra>')
 fig.update_layout(showlegend=True)
 fig.update_layout(
     title=f't-SNE projection of llm2vec embeddings from {plot_df.shape[0]} pathways',
@@ -27,7 +55,7 @@ fig.update_layout(
 fig.show()
 
 
-plot_df = pd.DataFrame(normalized_embedding, columns=['x', 'y'])
+plot_df = pd.DataFrame(normalized_embedding, columns=['x', 'y']).astype('float32')
 plot_df["GS_ID"] = list(prompts.keys())
 plot_df["NAME"] = [f'({key}) {pathway_info[key]["NAME"]}<br>{" ".join([p.split("), ")[-1] for p in prompts[key][1].split(" (")][:-1])}' for key in pathway_info.keys()]
 
@@ -37,7 +65,12 @@ color_map = {label: color for label, color in zip(unique_labels, px.colors.quali
 plot_df["Color"] = plot_df["Color"].map(color_map)
 
 
-fig = px.scatter(plot_df, x='x', y='y', hover_name='NAME', color='Color', width=800, height=800, opacity=0.7)   # color='Color'
+if len(plot_df) > RASTER_THRESHOLD:
+    fig = rasterize_points(plot_df)
+else:
+    scatter_df = decimate_points(plot_df) if len(plot_df) > LOD_THRESHOLD else plot_df
+    fig = px.scatter(scatter_df, x='x', y='y', hover_name='NAME', color='Color', width=800, height=800, opacity=0.7, render_mode='webgl')   # color='Color'
+    fig.update_traces(hovertemplate='%{hovertext}<extra></extra>')
 fig.update_layout(showlegend=True)
 fig.update_layout(
     title=f't-SNE projection of llm2vec embeddings from {plot_df.shape[0]} pathways',